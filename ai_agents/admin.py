@@ -1,10 +1,15 @@
 from django.contrib import admin
 from .models import AgentLog, Notification
+from .services.notifications import (
+    invalidate_unread_notifications,
+    reset_unread_count,
+)
+from src.admin_mixins import ChangelistDeferMixin
 from lending.models import LenderMatchResult
 
 
 @admin.register(AgentLog)
-class AgentLogAdmin(admin.ModelAdmin):
+class AgentLogAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = [
         "id",
         "agent_type",
@@ -16,6 +21,8 @@ class AgentLogAdmin(admin.ModelAdmin):
     list_filter = ["agent_type", "status", "created_at"]
     search_fields = ["user__username", "error_message"]
     readonly_fields = ["created_at", "completed_at", "input_data", "output_data"]
+    list_select_related = ["user"]
+    changelist_defer = ("input_data", "output_data", "error_message")
 
     fieldsets = (
         ("Thông tin", {"fields": ("agent_type", "user", "status")}),
@@ -25,15 +32,22 @@ class AgentLogAdmin(admin.ModelAdmin):
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = ["id", "user", "notification_type", "title", "is_read", "created_at"]
     list_filter = ["notification_type", "is_read", "created_at"]
     search_fields = ["user__username", "title", "message"]
     readonly_fields = ["created_at"]
+    list_select_related = ["user"]
+    changelist_defer = ("message",)
 
     actions = ["mark_as_read"]
 
     @admin.action(description="Đánh dấu đã đọc")
     def mark_as_read(self, request, queryset):
-        queryset.update(is_read=True)
-        self.message_user(request, f"Đã đánh dấu {queryset.count()} thông báo")
+        user_ids = set(queryset.values_list("user_id", flat=True))
+        updated = queryset.update(is_read=True)
+
+        # update() không phát signal nên tự xóa cache thông báo chưa đọc
+        invalidate_unread_notifications(*user_ids)
+        reset_unread_count(*user_ids)
+        self.message_user(request, f"Đã đánh dấu {updated} thông báo")
@@ -12,6 +12,14 @@ from .contract_generator import ContractGeneratorAgent as ContractGeneratorAgent
 from .payment_monitor import PaymentMonitorAgent as PaymentMonitorAgentLegacy
 from .dispute_resolver import DisputeResolverAgent as DisputeResolverAgentLegacy
 
+# Instance dùng chung cho mỗi process (LLM client và agent graph được tạo lazy
+# ở lần gọi đầu tiên rồi tái sử dụng)
+borrower_profiler_agent = BorrowerProfilerAgent()
+lender_matcher_agent = LenderMatcherAgent()
+contract_generator_agent = ContractGeneratorAgent()
+payment_monitor_agent = PaymentMonitorAgent()
+dispute_resolver_agent = DisputeResolverAgent()
+
 __all__ = [
     # New agents with tools
     "BorrowerProfilerAgent",
@@ -25,4 +33,10 @@ __all__ = [
     "ContractGeneratorAgentLegacy",
     "PaymentMonitorAgentLegacy",
     "DisputeResolverAgentLegacy",
+    # Shared instances
+    "borrower_profiler_agent",
+    "lender_matcher_agent",
+    "contract_generator_agent",
+    "payment_monitor_agent",
+    "dispute_resolver_agent",
 ]
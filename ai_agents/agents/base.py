@@ -137,6 +137,23 @@ class BaseAgent(ABC):
         log.execution_time = time.time() - start_time
         log.save()
 
+    def record_failure(self, user, input_data: Dict, error_message: str) -> Any:
+        """
+        Ghi log thất bại bằng một INSERT riêng (dùng sau khi transaction của
+        lần chạy bị rollback, khi log do _log_start/_log_failure tạo đã mất)
+        """
+        from ai_agents.models import AgentLog
+
+        return AgentLog.objects.create(
+            agent_type=self.agent_type,
+            user=user,
+            input_data=input_data,
+            output_data={"error": error_message},
+            error_message=error_message,
+            status="FAILED",
+            completed_at=timezone.now(),
+        )
+
     def _create_notification(
         self,
         user,
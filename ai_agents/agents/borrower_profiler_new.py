@@ -109,7 +109,7 @@ Hãy thực hiện xác minh cẩn thận và chính xác."""
             # Cập nhật loan status nếu có
             if loan_request and profile.kyc_status == "VERIFIED":
                 loan_request.status = "APPROVED"
-                loan_request.save()
+                loan_request.save(update_fields=["status"])
 
             result = {
                 "kyc_status": profile.kyc_status,
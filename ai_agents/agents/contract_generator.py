@@ -167,18 +167,25 @@ Trả về JSON với format:
 
     def _create_repayment_schedule(self, contract, contract_data: Dict):
         """Tạo lịch trả nợ"""
-        from lending.models import RepaymentSchedule
+        from lending.models import LoanContract, RepaymentSchedule
 
         schedule = contract_data.get("repayment_schedule", [])
 
         if schedule:
-            for item in schedule:
-                RepaymentSchedule.objects.create(
-                    contract=contract,
-                    due_date=item.get("due_date", date.today() + timedelta(days=30)),
-                    amount_due=Decimal(str(item.get("total", 0))),
-                    is_paid=False,
-                )
+            RepaymentSchedule.objects.bulk_create(
+                [
+                    RepaymentSchedule(
+                        contract=contract,
+                        due_date=item.get(
+                            "due_date", date.today() + timedelta(days=30)
+                        ),
+                        amount_due=Decimal(str(item.get("total", 0))),
+                        is_paid=False,
+                    )
+                    for item in schedule
+                ],
+                batch_size=500,
+            )
         else:
             # Generate default schedule if AI didn't provide
             loan_request = contract.loan_request
@@ -188,14 +195,20 @@ Trả về JSON với format:
                 loan_request.duration_months,
             )
 
-            for i in range(loan_request.duration_months):
-                due_date = date.today() + timedelta(days=30 * (i + 1))
-                RepaymentSchedule.objects.create(
-                    contract=contract,
-                    due_date=due_date,
-                    amount_due=Decimal(str(monthly_payment)),
-                    is_paid=False,
-                )
+            RepaymentSchedule.objects.bulk_create(
+                [
+                    RepaymentSchedule(
+                        contract=contract,
+                        due_date=date.today() + timedelta(days=30 * (i + 1)),
+                        amount_due=Decimal(str(monthly_payment)),
+                        is_paid=False,
+                    )
+                    for i in range(loan_request.duration_months)
+                ],
+                batch_size=500,
+            )
+
+        LoanContract.objects.filter(pk=contract.pk).refresh_schedule_counts()
 
     def _calculate_monthly_payment(
         self, principal: float, annual_rate: float, months: int
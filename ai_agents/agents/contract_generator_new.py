@@ -7,6 +7,8 @@ Agent Contract Generator: Tạo hợp đồng vay với tools
 
 import time
 import json
+import operator
+from itertools import accumulate, repeat
 from typing import Any, Dict, List, Optional
 from decimal import Decimal
 from langchain_core.tools import tool
@@ -22,24 +24,14 @@ from ai_agents.tools.sql_tools import (
 # ================= CONTRACT TOOLS =================
 
 
-@tool("calculate_loan_schedule")
-def calculate_loan_schedule(
+def calculate_loan_schedule_raw(
     principal: float,
     interest_rate: float,
     duration_months: int,
     payment_method: str = "EQUAL_PRINCIPAL",
-) -> str:
+) -> Dict[str, Any]:
     """
-    Tính lịch trả nợ chi tiết.
-
-    Args:
-        principal: Số tiền vay
-        interest_rate: Lãi suất %/năm
-        duration_months: Thời hạn vay (tháng)
-        payment_method: Phương thức trả (EQUAL_PRINCIPAL hoặc EQUAL_PAYMENT)
-
-    Returns:
-        JSON lịch trả nợ
+    Tính lịch trả nợ, trả về dict (không qua JSON) để code Python gọi trực tiếp.
     """
     monthly_rate = interest_rate / 100 / 12
     schedule = []
@@ -76,44 +68,96 @@ def calculate_loan_schedule(
             total_interest += interest
             total_payment += monthly_payment
     else:
-        # Trả gốc đều, lãi giảm dần
+        # Trả gốc đều, lãi giảm dần. Dư nợ đầu kỳ được trừ dần đúng thứ tự như
+        # vòng lặp cũ để các kỳ làm tròn .5 không lệch 1 đồng
         principal_payment = principal / duration_months
+        rounded_principal = round(principal_payment, 0)
 
-        for month in range(1, duration_months + 1):
-            interest = remaining * monthly_rate
-            payment = principal_payment + interest
-            remaining -= principal_payment
-
-            schedule.append(
-                {
-                    "month": month,
-                    "principal_payment": round(principal_payment, 0),
-                    "interest_payment": round(interest, 0),
-                    "total_payment": round(payment, 0),
-                    "remaining_balance": max(0, round(remaining, 0)),
-                }
+        openings = list(
+            accumulate(
+                repeat(principal_payment, duration_months - 1),
+                operator.sub,
+                initial=principal,
             )
+        )
+        interests = [opening * monthly_rate for opening in openings]
 
-            total_interest += interest
-            total_payment += payment
+        schedule = [
+            {
+                "month": m + 1,
+                "principal_payment": rounded_principal,
+                "interest_payment": round(interest, 0),
+                "total_payment": round(principal_payment + interest, 0),
+                "remaining_balance": max(0, round(opening - principal_payment, 0)),
+            }
+            for m, (opening, interest) in enumerate(zip(openings, interests))
+        ]
 
-    return json.dumps(
-        {
-            "success": True,
-            "data": {
-                "principal": principal,
-                "interest_rate": interest_rate,
-                "duration_months": duration_months,
-                "payment_method": payment_method,
-                "total_interest": round(total_interest, 0),
-                "total_payment": round(total_payment, 0),
-                "schedule": schedule,
-            },
-        },
-        ensure_ascii=False,
-        indent=2,
+        total_interest = sum(interests)
+        total_payment = sum(principal_payment + interest for interest in interests)
+
+    return {
+        "principal": principal,
+        "interest_rate": interest_rate,
+        "duration_months": duration_months,
+        "payment_method": payment_method,
+        "total_interest": round(total_interest, 0),
+        "total_payment": round(total_payment, 0),
+        "schedule": schedule,
+    }
+
+
+@tool("calculate_loan_schedule")
+def calculate_loan_schedule(
+    principal: float,
+    interest_rate: float,
+    duration_months: int,
+    payment_method: str = "EQUAL_PRINCIPAL",
+) -> str:
+    """
+    Tính lịch trả nợ chi tiết.
+
+    Args:
+        principal: Số tiền vay
+        interest_rate: Lãi suất %/năm
+        duration_months: Thời hạn vay (tháng)
+        payment_method: Phương thức trả (EQUAL_PRINCIPAL hoặc EQUAL_PAYMENT)
+
+    Returns:
+        JSON lịch trả nợ
+    """
+    data = calculate_loan_schedule_raw(
+        principal, interest_rate, duration_months, payment_method
+    )
+    return json.dumps({"success": True, "data": data}, ensure_ascii=False, indent=2)
+
+
+LOAN_SCHEDULE_CACHE_TIMEOUT = 3600
+
+
+def get_cached_loan_schedule(
+    principal: float,
+    interest_rate: float,
+    duration_months: int,
+    payment_method: str = "EQUAL_PRINCIPAL",
+) -> Dict[str, Any]:
+    """
+    Lịch trả nợ (dict) được cache theo (số tiền, lãi suất, kỳ hạn, phương thức).
+    Lịch trả nợ chỉ phụ thuộc vào các tham số này nên có thể dùng lại.
+    """
+    from django.core.cache import cache
+
+    key = (
+        f"loan_schedule:{principal}:{interest_rate}:{duration_months}:{payment_method}"
     )
 
+    def compute():
+        return calculate_loan_schedule_raw(
+            principal, interest_rate, duration_months, payment_method
+        )
+
+    return cache.get_or_set(key, compute, LOAN_SCHEDULE_CACHE_TIMEOUT)
+
 
 @tool("generate_contract_content")
 def generate_contract_content(
@@ -455,7 +499,7 @@ def create_contract_record(
 
         # Update loan request status
         loan_request.status = "CONTRACT_CREATED"
-        loan_request.save()
+        loan_request.save(update_fields=["status"])
 
         return json.dumps(
             {
@@ -573,15 +617,12 @@ Hãy tạo hợp đồng chính xác và đầy đủ thông tin."""
             lender_info = validation_data.get("lender", {})
 
             # 2. Calculate schedule
-            schedule_result = calculate_loan_schedule.invoke(
-                {
-                    "principal": float(loan_request.amount),
-                    "interest_rate": float(loan_request.interest_rate),
-                    "duration_months": loan_request.duration_months,
-                    "payment_method": payment_method,
-                }
+            schedule = get_cached_loan_schedule(
+                float(loan_request.amount),
+                float(loan_request.interest_rate),
+                loan_request.duration_months,
+                payment_method,
             )
-            schedule_data = json.loads(schedule_result)
 
             # 3. Generate contract content
             contract_result = generate_contract_content.invoke(
@@ -619,7 +660,7 @@ Hãy tạo hợp đồng chính xác và đầy đủ thông tin."""
             result = {
                 "contract_id": create_data["data"]["contract_id"],
                 "contract": create_data["data"],
-                "schedule": schedule_data.get("data", {}),
+                "schedule": schedule,
                 "parties": {
                     "borrower": borrower_info,
                     "lender": lender_info,
@@ -705,12 +746,22 @@ Vui lòng xem và ký hợp đồng.""",
 
                 # Update loan request
                 contract.loan_request.status = "FUNDED"
-                contract.loan_request.save()
+                contract.loan_request.save(update_fields=["status"])
 
                 # Create payment schedule
                 self._create_payment_schedule(contract)
 
-            contract.save()
+            # Không ghi đè bộ đếm kỳ hạn vừa được _create_payment_schedule tính
+            contract.save(
+                update_fields=[
+                    "borrower_signed",
+                    "borrower_signed_at",
+                    "lender_signed",
+                    "lender_signed_at",
+                    "status",
+                    "is_active",
+                ]
+            )
 
             return {
                 "success": True,
@@ -726,29 +777,30 @@ Vui lòng xem và ký hợp đồng.""",
 
     def _create_payment_schedule(self, contract):
         """Tạo lịch thanh toán sau khi hợp đồng có hiệu lực"""
-        from lending.models import PaymentSchedule
+        from lending.models import LoanContract, PaymentSchedule
         from datetime import timedelta
 
         # Calculate schedule
-        schedule_result = calculate_loan_schedule.invoke(
-            {
-                "principal": float(contract.principal_amount),
-                "interest_rate": float(contract.interest_rate),
-                "duration_months": (contract.end_date - contract.start_date).days // 30,
-                "payment_method": "EQUAL_PRINCIPAL",
-            }
+        schedule = get_cached_loan_schedule(
+            float(contract.principal_amount),
+            float(contract.interest_rate),
+            (contract.end_date - contract.start_date).days // 30,
+            "EQUAL_PRINCIPAL",
         )
-        schedule_data = json.loads(schedule_result)
 
-        if schedule_data.get("success"):
-            for item in schedule_data["data"]["schedule"]:
-                due_date = contract.start_date + timedelta(days=item["month"] * 30)
-
-                PaymentSchedule.objects.create(
+        PaymentSchedule.objects.bulk_create(
+            [
+                PaymentSchedule(
                     contract=contract,
                     installment_number=item["month"],
-                    due_date=due_date,
+                    due_date=contract.start_date + timedelta(days=item["month"] * 30),
                     principal_amount=item["principal_payment"],
                     interest_amount=item["interest_payment"],
                     total_amount=item["total_payment"],
                 )
+                for item in schedule["schedule"]
+            ],
+            batch_size=500,
+        )
+        # bulk_create không phát post_save
+        LoanContract.objects.filter(pk=contract.pk).refresh_schedule_counts()
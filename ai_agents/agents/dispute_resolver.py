@@ -193,7 +193,7 @@ Trả về JSON với format:
 
         # Mark contract as disputed
         dispute.contract.is_disputed = True
-        dispute.contract.save()
+        dispute.contract.save(update_fields=["is_disputed"])
 
     def _notify_parties(self, dispute, analysis: Dict):
         """Thông báo cho các bên liên quan"""
@@ -240,7 +240,7 @@ Trả về JSON với format:
 
         # Update contract
         dispute.contract.is_disputed = False
-        dispute.contract.save()
+        dispute.contract.save(update_fields=["is_disputed"])
 
         # Notify parties
         borrower = dispute.contract.loan_request.borrower
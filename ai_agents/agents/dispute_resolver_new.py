@@ -104,7 +104,7 @@ def get_dispute_details(dispute_id: int) -> str:
         ).get(id=dispute_id)
 
         # Get evidence
-        evidence_list = DisputeEvidence.objects.filter(dispute=dispute)
+        evidence_list = DisputeEvidence.objects.filter(dispute=dispute).with_related()
         evidence_data = [
             {
                 "id": e.id,
@@ -188,8 +188,10 @@ def get_contract_history(contract_id: int) -> str:
         ]
 
         # Transaction history
-        transactions = PaymentTransaction.objects.filter(contract=contract).order_by(
-            "-created_at"
+        transactions = (
+            PaymentTransaction.objects.filter(contract=contract)
+            .with_related()
+            .order_by("-created_at")
         )
         transaction_data = [
             {
@@ -233,7 +233,7 @@ Trả về JSON với format:
 
             # Mark reminder as sent
             schedule.reminder_sent = True
-            schedule.save()
+            schedule.save(update_fields=["reminder_sent"])
 
         except Exception as e:
             # Fallback to simple notification
@@ -246,13 +246,22 @@ Trả về JSON với format:
 
     def mark_payment_completed(self, schedule_id: int) -> Dict[str, Any]:
         """Đánh dấu một khoản đã thanh toán"""
-        from lending.models import RepaymentSchedule
+        from django.db.models import F
+        from lending.models import LoanContract, RepaymentSchedule
 
         try:
             schedule = RepaymentSchedule.objects.get(id=schedule_id)
-            schedule.is_paid = True
-            schedule.paid_date = date.today()
-            schedule.save()
+
+            # Chỉ đánh dấu (và tăng bộ đếm) khi kỳ hạn chưa trả; update() không
+            # phát signal nên tự cập nhật paid_schedules
+            marked = RepaymentSchedule.objects.filter(
+                pk=schedule.pk, is_paid=False
+            ).update(is_paid=True, paid_date=date.today())
+            if not marked:
+                return {"success": False, "error": "Schedule already paid"}
+            LoanContract.objects.filter(pk=schedule.contract_id).update(
+                paid_schedules=F("paid_schedules") + 1
+            )
 
             # Notify both parties
             borrower = schedule.contract.loan_request.borrower
@@ -273,15 +282,15 @@ Trả về JSON với format:
             )
 
             # Check if all payments completed
-            remaining = RepaymentSchedule.objects.filter(
+            has_remaining = RepaymentSchedule.objects.filter(
                 contract=schedule.contract, is_paid=False
-            ).count()
+            ).exists()
 
-            if remaining == 0:
+            if not has_remaining:
                 schedule.contract.is_active = False
-                schedule.contract.save()
+                schedule.contract.save(update_fields=["is_active"])
 
-            return {"success": True, "remaining_payments": remaining}
+            return {"success": True, "contract_completed": not has_remaining}
 
         except RepaymentSchedule.DoesNotExist:
             return {"success": False, "error": "Schedule not found"}
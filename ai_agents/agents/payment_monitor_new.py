@@ -196,7 +196,7 @@ def get_overdue_payments(days_threshold: int = 0) -> str:
 
         overdue = PaymentSchedule.objects.filter(
             status="PENDING", due_date__lt=threshold_date, contract__is_active=True
-        ).select_related("contract", "contract__borrower", "contract__lender")
+        ).with_related()
 
         overdue_list = []
         total_overdue = 0
@@ -276,6 +276,11 @@ def process_payment(
                     }
                 )
 
+            if payment.status == "PAID":
+                return json.dumps(
+                    {"success": False, "error": "Kỳ thanh toán này đã được thanh toán"}
+                )
+
             # Calculate late fee if any
             late_fee = 0
             late_days = 0
@@ -293,9 +298,17 @@ def process_payment(
                     }
                 )
 
+            # Khóa ví hai bên theo thứ tự pk để tránh deadlock
+            profiles = {
+                p.user_id: p
+                for p in UserProfile.objects.select_for_update()
+                .filter(user_id__in=[user_id, payment.contract.lender_id])
+                .order_by("pk")
+            }
+            borrower_profile = profiles[user_id]
+            lender_profile = profiles[payment.contract.lender_id]
+
             # Check wallet balance if using wallet
-            borrower_profile = UserProfile.objects.get(user=user)
-            lender_profile = UserProfile.objects.get(user=payment.contract.lender)
 
             if payment_method == "WALLET":
                 if float(borrower_profile.wallet_balance or 0) < total_due:
@@ -338,7 +351,15 @@ def process_payment(
             payment.status = "PAID"
             payment.late_fee = late_fee
             payment.late_days = late_days
-            payment.save()
+            payment.save(
+                update_fields=[
+                    "paid_amount",
+                    "paid_date",
+                    "status",
+                    "late_fee",
+                    "late_days",
+                ]
+            )
 
             # Check if all payments done
             pending_count = PaymentSchedule.objects.filter(
@@ -348,11 +369,11 @@ def process_payment(
             if pending_count == 0:
                 payment.contract.status = "COMPLETED"
                 payment.contract.is_active = False
-                payment.contract.save()
+                payment.contract.save(update_fields=["status", "is_active"])
 
                 # Update loan request
                 payment.contract.loan_request.status = "COMPLETED"
-                payment.contract.loan_request.save()
+                payment.contract.loan_request.save(update_fields=["status"])
 
             return json.dumps(
                 {
@@ -792,6 +813,7 @@ Kỳ {payment.installment_number}: {amount:,.0f} VNĐ
                 ).update(
                     status="PAID", paid_date=datetime.now().date(), note="Early payoff"
                 )
+                LoanContract.objects.filter(pk=contract.pk).refresh_schedule_counts()
 
                 # Create transaction
                 PaymentTransaction.objects.create(
@@ -807,10 +829,10 @@ Kỳ {payment.installment_number}: {amount:,.0f} VNĐ
                 # Close contract
                 contract.status = "COMPLETED"
                 contract.is_active = False
-                contract.save()
+                contract.save(update_fields=["status", "is_active"])
 
                 contract.loan_request.status = "COMPLETED"
-                contract.loan_request.save()
+                contract.loan_request.save(update_fields=["status"])
 
             # Notify
             self._create_notification(
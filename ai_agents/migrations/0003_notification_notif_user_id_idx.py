@@ -0,0 +1,17 @@
+# Generated by Django 5.2.9 on 2026-10-16 14:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_agents', '0002_notification_related_loan_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-id'], name='notif_user_id_idx'),
+        ),
+    ]
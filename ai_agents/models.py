@@ -80,6 +80,10 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Khớp phân trang keyset của trang thông báo (user_id, id < before)
+            models.Index(fields=["user", "-id"], name="notif_user_id_idx"),
+        ]
 
     def __str__(self):
         return f"{self.notification_type} - {self.user.username}"
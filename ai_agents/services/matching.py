@@ -3,12 +3,23 @@ Loan Matching Service - Kết nối người vay và người cho vay
 """
 
 from decimal import Decimal
+from operator import itemgetter
 from typing import List, Dict, Any, Optional
-from django.db.models import Q, F
+from django.db.models import Q, F, Case, When, Value, FloatField
+from django.db.models.functions import Cast, Greatest, Least
 from django.contrib.auth.models import User
+from django.core.cache import cache
 
 from lending.models import LoanRequest, LenderProfile, LenderMatchResult
 from ai_agents.models import Notification
+from ai_agents.services.notifications import (
+    adjust_unread_count,
+    invalidate_unread_notifications,
+)
+
+
+# Thời gian cache danh sách khoản vay phù hợp của một lender (giây)
+MATCHING_LOANS_CACHE_TIMEOUT = 300
 
 
 class LoanMatchingService:
@@ -40,7 +51,7 @@ class LoanMatchingService:
                 )
 
         # Sắp xếp theo match score
-        matching_lenders.sort(key=lambda x: x["match_score"], reverse=True)
+        matching_lenders.sort(key=itemgetter("match_score"), reverse=True)
 
         return matching_lenders
 
@@ -98,6 +109,74 @@ class LoanMatchingService:
 
         return min(100, score)
 
+    # Mức rủi ro người vay được chấp nhận đủ điểm theo khẩu vị rủi ro của lender
+    ACCEPTED_RISK_LEVELS = {"MEDIUM": ["LOW", "MEDIUM"], "LOW": ["LOW"]}
+
+    def match_score_expression(self, lender: LenderProfile):
+        """
+        Biểu thức SQL tương đương _calculate_match_score để chấm điểm và sắp xếp
+        khoản vay ngay trong DB (dùng trên queryset LoanRequest)
+        """
+        amount = Cast("amount", FloatField())
+        duration = Cast("duration_months", FloatField())
+        rate = Cast("interest_rate", FloatField())
+        min_amount = float(lender.min_amount)
+        max_amount = float(lender.max_amount)
+        duration_min = lender.preferred_duration_min
+        duration_max = lender.preferred_duration_max
+        min_rate = lender.min_interest_rate
+
+        amount_score = Case(
+            When(
+                amount__gte=lender.min_amount,
+                amount__lte=lender.max_amount,
+                then=Value(30.0),
+            ),
+            When(amount__lt=lender.min_amount, then=amount / min_amount * 15.0),
+            default=Value(max_amount) / amount * 15.0,
+            output_field=FloatField(),
+        )
+        duration_score = Case(
+            When(
+                duration_months__gte=duration_min,
+                duration_months__lte=duration_max,
+                then=Value(25.0),
+            ),
+            When(
+                duration_months__lt=duration_min,
+                then=Greatest(Value(0.0), 25.0 - (duration_min - duration) * 2.0),
+            ),
+            default=Greatest(Value(0.0), 25.0 - (duration - duration_max) * 2.0),
+            output_field=FloatField(),
+        )
+        rate_score = Case(
+            When(interest_rate__gte=min_rate, then=Value(25.0)),
+            default=Greatest(Value(0.0), 25.0 - (min_rate - rate) * 5.0),
+            output_field=FloatField(),
+        )
+
+        if lender.risk_tolerance == "HIGH":
+            risk_when = When(borrower__risk_profile__isnull=False, then=Value(20.0))
+        else:
+            risk_when = When(
+                borrower__risk_profile__risk_level__in=self.ACCEPTED_RISK_LEVELS.get(
+                    lender.risk_tolerance, []
+                ),
+                then=Value(20.0),
+            )
+        risk_score = Case(
+            When(borrower__risk_profile__isnull=True, then=Value(14.0)),
+            risk_when,
+            default=Value(10.0),
+            output_field=FloatField(),
+        )
+
+        return Least(
+            Value(100.0),
+            amount_score + duration_score + rate_score + risk_score,
+            output_field=FloatField(),
+        )
+
     def _get_match_reasons(self, loan: LoanRequest, lender: LenderProfile) -> List[str]:
         """Lấy lý do match"""
         reasons = []
@@ -121,11 +200,13 @@ class LoanMatchingService:
         """
         Tìm khoản vay phù hợp với người cho vay
         """
-        # Lọc các khoản vay APPROVED và chưa có người cho vay
+        # Lọc các khoản vay APPROVED và chưa có người cho vay; risk_profile được
+        # dùng khi tính điểm, nạp cùng một truy vấn
         loans = (
             LoanRequest.objects.filter(status="APPROVED")
-            .exclude(borrower=lender.user)
+            .exclude(borrower_id=lender.user_id)
             .filter(loancontract__isnull=True)  # Chưa có contract
+            .select_related("borrower__risk_profile")
         )
 
         matching_loans = []
@@ -140,21 +221,65 @@ class LoanMatchingService:
                     }
                 )
 
-        matching_loans.sort(key=lambda x: x["match_score"], reverse=True)
+        matching_loans.sort(key=itemgetter("match_score"), reverse=True)
         return matching_loans
 
+    def get_cached_matching_loans(
+        self, lender: LenderProfile, limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Top khoản vay phù hợp, cache theo (profile, updated_at): profile thay đổi
+        thì updated_at đổi theo nên key cũ tự bị bỏ qua
+        """
+        key = "matching_loans:{}:{}:{}".format(
+            lender.pk, lender.updated_at.timestamp(), limit
+        )
+        return cache.get_or_set(
+            key,
+            lambda: self.find_matching_loans(lender)[:limit],
+            MATCHING_LOANS_CACHE_TIMEOUT,
+        )
+
     def save_match_results(self, loan: LoanRequest, matches: List[Dict]) -> None:
         """Lưu kết quả matching vào database"""
         # Xóa matches cũ
         LenderMatchResult.objects.filter(loan_request=loan).delete()
 
-        for match in matches:
-            LenderMatchResult.objects.create(
-                loan_request=loan,
-                lender=match["lender_profile"].user,
-                match_score=match["match_score"],
-                match_reasons=match["reasons"],
-            )
+        LenderMatchResult.objects.bulk_create(
+            [
+                LenderMatchResult(
+                    loan_request=loan,
+                    lender_id=match["lender_profile"].user_id,
+                    match_score=match["match_score"],
+                    match_reasons=match["reasons"],
+                )
+                for match in matches
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+
+    def save_lender_match_results(
+        self, lender: LenderProfile, matches: List[Dict]
+    ) -> None:
+        """Lưu kết quả matching phía lender (thay kết quả cũ của khoản vay đang mở)"""
+        LenderMatchResult.objects.filter(
+            lender_id=lender.user_id, loan_request__status="APPROVED"
+        ).delete()
+
+        LenderMatchResult.objects.bulk_create(
+            [
+                LenderMatchResult(
+                    loan_request=match["loan"],
+                    lender_id=lender.user_id,
+                    match_score=match["match_score"],
+                    match_reasons=match["reasons"],
+                )
+                for match in matches
+            ],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
 
     def notify_matching_lenders(self, loan: LoanRequest) -> int:
         """
@@ -166,21 +291,28 @@ class LoanMatchingService:
         matches = self.find_matching_lenders(loan)
         self.save_match_results(loan, matches)
 
-        count = 0
-        for match in matches:
-            lender = match["lender_profile"].user
-            Notification.objects.create(
-                user=lender,
-                notification_type="LOAN_MATCH",
-                title="Có khoản vay phù hợp mới!",
-                message=f"""Khoản vay {loan.amount:,.0f} VNĐ với lãi suất {loan.interest_rate}%/năm, kỳ hạn {loan.duration_months} tháng.
+        Notification.objects.bulk_create(
+            [
+                Notification(
+                    user_id=match["lender_profile"].user_id,
+                    notification_type="LOAN_MATCH",
+                    title="Có khoản vay phù hợp mới!",
+                    message=f"""Khoản vay {loan.amount:,.0f} VNĐ với lãi suất {loan.interest_rate}%/năm, kỳ hạn {loan.duration_months} tháng.
 Độ phù hợp: {match['match_score']:.0f}%
 {', '.join(match['reasons'])}""",
-                related_loan=loan,
-            )
-            count += 1
+                    related_loan=loan,
+                )
+                for match in matches
+            ],
+            batch_size=500,
+        )
+        # bulk_create không phát post_save
+        lender_ids = [match["lender_profile"].user_id for match in matches]
+        invalidate_unread_notifications(*lender_ids)
+        for lender_id in lender_ids:
+            adjust_unread_count(lender_id, 1)
 
-        return count
+        return len(matches)
 
     def notify_matching_loans(self, lender: LenderProfile) -> int:
         """
@@ -190,6 +322,7 @@ class LoanMatchingService:
             Số lượng loan được thông báo
         """
         matches = self.find_matching_loans(lender)
+        self.save_lender_match_results(lender, matches)
 
         if matches:
             # Gửi 1 thông báo tổng hợp
@@ -0,0 +1,77 @@
+"""
+Notification Service - Cache thông báo chưa đọc cho dashboard
+"""
+
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ai_agents.models import Notification
+
+# Thông báo thay đổi thường xuyên nên chỉ cache ngắn (giây); cache cục bộ (LocMem)
+# không nhận lệnh xóa từ process khác nên giữ ngắn hơn nữa
+UNREAD_NOTIFICATIONS_CACHE_TIMEOUT = 30 if settings.CACHE_IS_SHARED else 5
+UNREAD_NOTIFICATIONS_LIMIT = 5
+
+# Bộ đếm chưa đọc được tăng/giảm trực tiếp; hết hạn định kỳ để tự đồng bộ lại với DB
+UNREAD_COUNT_CACHE_TIMEOUT = 3600 if settings.CACHE_IS_SHARED else 5
+
+
+def _unread_cache_key(user_id) -> str:
+    return f"notif:unread:{user_id}"
+
+
+def _unread_count_cache_key(user_id) -> str:
+    return f"notif:unread_count:{user_id}"
+
+
+def get_unread_notifications(user_id) -> List[Dict[str, Any]]:
+    """
+    Các thông báo chưa đọc mới nhất của user (dạng dict), cache theo user_id
+    """
+    key = _unread_cache_key(user_id)
+    notifications = cache.get(key)
+    if notifications is None:
+        notifications = list(
+            Notification.objects.filter(user_id=user_id, is_read=False)
+            .order_by("-id")
+            .values("id", "title", "message", "created_at", "related_loan_id")[
+                :UNREAD_NOTIFICATIONS_LIMIT
+            ]
+        )
+        cache.set(key, notifications, UNREAD_NOTIFICATIONS_CACHE_TIMEOUT)
+    return notifications
+
+
+def invalidate_unread_notifications(*user_ids) -> None:
+    """Xóa cache thông báo chưa đọc; gọi sau bulk_create/update (bỏ qua signal)"""
+    cache.delete_many([_unread_cache_key(user_id) for user_id in user_ids])
+
+
+def get_unread_count(user_id) -> int:
+    """Số thông báo chưa đọc của user; chỉ COUNT trong DB khi cache chưa có"""
+    key = _unread_count_cache_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(key, count, UNREAD_COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def adjust_unread_count(user_id, delta: int) -> None:
+    """
+    Cộng delta vào bộ đếm chưa đọc (incr/decr nguyên tử trên Redis).
+    Chưa có bộ đếm thì bỏ qua, lần đọc sau sẽ COUNT lại.
+    """
+    if not delta:
+        return
+    try:
+        cache.incr(_unread_count_cache_key(user_id), delta)
+    except ValueError:
+        pass
+
+
+def reset_unread_count(*user_ids) -> None:
+    """Bỏ bộ đếm chưa đọc để lần đọc sau COUNT lại từ DB"""
+    cache.delete_many([_unread_count_cache_key(user_id) for user_id in user_ids])
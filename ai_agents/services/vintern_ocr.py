@@ -32,7 +32,7 @@ class VinternOCRService:
                 "expiry_date": "01/01/2030"
             }
         """
-        return self._call_vintern_api(image_path, "ID_CARD_FRONT")
+        return self._call_vintern_api(self._read_image(image_path), "ID_CARD_FRONT")
 
     def extract_id_card_back(self, image_path: str) -> Dict[str, Any]:
         """
@@ -45,14 +45,30 @@ class VinternOCRService:
                 "characteristics": "Nốt ruồi...",
             }
         """
-        return self._call_vintern_api(image_path, "ID_CARD_BACK")
+        return self._call_vintern_api(self._read_image(image_path), "ID_CARD_BACK")
 
-    def _call_vintern_api(self, image_path: str, doc_type: str) -> Dict[str, Any]:
+    def extract_from_bytes(self, image_bytes: bytes, doc_type: str) -> Dict[str, Any]:
+        """
+        OCR ảnh đã có sẵn trong bộ nhớ (không mở lại file)
+
+        Args:
+            image_bytes: Nội dung file ảnh
+            doc_type: ID_CARD_FRONT hoặc ID_CARD_BACK
+        """
+        if doc_type not in ("ID_CARD_FRONT", "ID_CARD_BACK"):
+            return {"success": False, "error": "Loại tài liệu không hỗ trợ"}
+        return self._call_vintern_api(image_bytes, doc_type)
+
+    @staticmethod
+    def _read_image(image_path: str) -> bytes:
+        with open(image_path, "rb") as f:
+            return f.read()
+
+    def _call_vintern_api(self, image_bytes: bytes, doc_type: str) -> Dict[str, Any]:
         """Gọi API Vintern để OCR"""
         try:
-            # Đọc và encode ảnh
-            with open(image_path, "rb") as f:
-                image_base64 = base64.b64encode(f.read()).decode("utf-8")
+            # Encode ảnh
+            image_base64 = base64.b64encode(image_bytes).decode("utf-8")
 
             # Gọi API
             response = requests.post(
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Notification
+from .services.notifications import (
+    adjust_unread_count,
+    invalidate_unread_notifications,
+    reset_unread_count,
+)
+
+
+@receiver(post_save, sender=Notification)
+@receiver(post_delete, sender=Notification)
+def clear_unread_notifications_cache(sender, instance, **kwargs):
+    """Thông báo thay đổi thì bỏ cache thông báo chưa đọc của user"""
+    invalidate_unread_notifications(instance.user_id)
+
+    # Thông báo mới chưa đọc: tăng bộ đếm; thay đổi khác: đếm lại từ DB
+    if kwargs.get("created") and not instance.is_read:
+        adjust_unread_count(instance.user_id, 1)
+    else:
+        reset_unread_count(instance.user_id)
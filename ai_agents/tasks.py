@@ -0,0 +1,107 @@
+"""
+Tác vụ nền chạy AI agents ngoài request/response
+"""
+
+from celery import shared_task
+
+
+@shared_task
+def profile_loan_request_task(loan_id):
+    """
+    Chạy BorrowerProfilerAgent cho đơn vay mới; nếu đơn được duyệt thì
+    thông báo cho các lender phù hợp và cho người vay
+    """
+    from ai_agents.agents import borrower_profiler_agent
+    from lending.models import LoanRequest
+
+    loan = LoanRequest.objects.select_related("borrower").get(pk=loan_id)
+    borrower_profiler_agent.process(loan.borrower, loan)
+
+    if loan.status != "APPROVED":
+        return 0
+    return compute_matches_for_loan(loan.id)
+
+
+@shared_task
+def compute_matches_for_loan(loan_id):
+    """
+    Tính và lưu điểm phù hợp (LenderMatchResult) của đơn vay đã duyệt với các
+    lender, đồng thời thông báo cho lender và người vay
+    """
+    from ai_agents.services.matching import loan_matching
+    from lending.models import LoanRequest
+
+    loan = LoanRequest.objects.select_related("borrower__risk_profile").get(
+        pk=loan_id
+    )
+    lender_count = loan_matching.notify_matching_lenders(loan)
+    if lender_count > 0:
+        loan_matching.notify_borrower_has_match(loan, lender_count)
+    else:
+        loan_matching.notify_borrower_no_match(loan)
+    return lender_count
+
+
+@shared_task
+def compute_matches_for_lender(user_id):
+    """
+    Tính và lưu điểm phù hợp của các khoản vay đang mở với profile lender
+    (khi lender đăng ký hoặc cập nhật tiêu chí), rồi gửi thông báo tổng hợp
+    """
+    from ai_agents.services.matching import loan_matching
+    from lending.models import LenderProfile
+
+    profile = (
+        LenderProfile.objects.select_related("user")
+        .filter(user_id=user_id, is_active=True)
+        .first()
+    )
+    if profile is None:
+        return 0
+    return loan_matching.notify_matching_loans(profile)
+
+
+@shared_task
+def match_lenders_task(loan_ids):
+    """Chạy LenderMatcherAgent cho các đơn vay đã duyệt"""
+    from ai_agents.agents import lender_matcher_agent
+    from lending.models import LoanRequest
+
+    loans = LoanRequest.objects.select_related("borrower").filter(pk__in=loan_ids)
+    for loan in loans.iterator(chunk_size=100):
+        lender_matcher_agent.process(loan)
+    return len(loan_ids)
+
+
+@shared_task
+def analyze_disputes_task(dispute_ids):
+    """Chạy DisputeResolverAgent phân tích các tranh chấp"""
+    from ai_agents.agents import dispute_resolver_agent
+    from lending.models import Dispute
+
+    disputes = Dispute.objects.select_related(
+        "contract__loan_request__borrower", "complainant"
+    ).filter(pk__in=dispute_ids)
+    for dispute in disputes.iterator(chunk_size=100):
+        dispute_resolver_agent.process(dispute, action="analyze")
+    return len(dispute_ids)
+
+
+@shared_task
+def send_payment_reminders_task(contract_ids=None):
+    """
+    Chạy PaymentMonitorAgent gửi nhắc nhở thanh toán.
+    Có contract_ids thì chỉ nhắc các hợp đồng đó, không thì giám sát toàn bộ.
+    """
+    from ai_agents.agents import payment_monitor_agent
+    from lending.models import LoanContract
+
+    if contract_ids is None:
+        return payment_monitor_agent.process()
+
+    contracts = LoanContract.objects.select_related("borrower").filter(
+        pk__in=contract_ids
+    )
+    for contract in contracts.iterator(chunk_size=100):
+        payment_monitor_agent.process(contract, action="remind")
+    return len(contract_ids)
@@ -267,7 +267,11 @@ def save_kyc_verification_result(user_id: int, verification_result: str) -> str:
             profile.kyc_note = f"Không khớp: {', '.join(mismatches)}. {recommendation}"
             message = f"KYC bị từ chối. Độ khớp: {profile.ocr_match_score}%. Lý do: {profile.kyc_note}"
 
-        profile.save()
+        # Chỉ ghi các cột KYC, không đè balance bằng giá trị đọc từ trước
+        update_fields = ["ocr_verified", "ocr_match_score", "ocr_data", "kyc_status"]
+        if profile.kyc_status == "REJECTED":
+            update_fields.append("kyc_note")
+        profile.save(update_fields=update_fields)
         return message
 
     except User.DoesNotExist:
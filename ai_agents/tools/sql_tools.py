@@ -349,15 +349,19 @@ def find_matching_lenders_for_loan(loan_id: int) -> str:
     except LoanRequest.DoesNotExist:
         return f"Không tìm thấy khoản vay với ID: {loan_id}"
 
-    # Tìm lender phù hợp
-    lenders = LenderProfile.objects.filter(
-        is_active=True,
-        min_amount__lte=loan.amount,
-        max_amount__gte=loan.amount,
-        min_interest_rate__lte=loan.interest_rate,
-        preferred_duration_min__lte=loan.duration_months,
-        preferred_duration_max__gte=loan.duration_months,
-    ).exclude(user=loan.borrower)
+    # Tìm lender phù hợp (user và profile số dư nạp cùng truy vấn)
+    lenders = (
+        LenderProfile.objects.filter(
+            is_active=True,
+            min_amount__lte=loan.amount,
+            max_amount__gte=loan.amount,
+            min_interest_rate__lte=loan.interest_rate,
+            preferred_duration_min__lte=loan.duration_months,
+            preferred_duration_max__gte=loan.duration_months,
+        )
+        .exclude(user_id=loan.borrower_id)
+        .select_related("user__profile")
+    )
 
     if not lenders:
         return f"Không tìm thấy người cho vay phù hợp với khoản vay #{loan_id}"
@@ -22,10 +22,9 @@ def agent_logs_view(request):
 @require_http_methods(["POST"])
 def run_borrower_profiler(request):
     """Chạy Agent Borrower Profiler"""
-    from .agents import BorrowerProfilerAgent
+    from .agents import borrower_profiler_agent
 
-    agent = BorrowerProfilerAgent()
-    result = agent.process(request.user)
+    result = borrower_profiler_agent.process(request.user)
     return JsonResponse(result)
 
 
@@ -34,11 +33,10 @@ def run_borrower_profiler(request):
 def run_lender_matcher(request, loan_id):
     """Chạy Agent Lender Matcher"""
     from lending.models import LoanRequest
-    from .agents import LenderMatcherAgent
+    from .agents import lender_matcher_agent
 
     loan = LoanRequest.objects.get(id=loan_id, borrower=request.user)
-    agent = LenderMatcherAgent()
-    result = agent.process(loan)
+    result = lender_matcher_agent.process(loan)
     return JsonResponse(result)
 
 
@@ -70,18 +68,17 @@ def get_matches(request, loan_id):
 def approve_loan(request, loan_id):
     """Admin: Duyệt đơn vay (sau khi AI phân tích)"""
     from lending.models import LoanRequest
-    from .agents import LenderMatcherAgent
+    from .tasks import match_lenders_task
 
     if not request.user.is_staff:
         return JsonResponse({"success": False, "error": "Không có quyền!"})
 
     loan = LoanRequest.objects.get(id=loan_id)
     loan.status = "APPROVED"
-    loan.save()
+    loan.save(update_fields=["status"])
 
-    # Auto run matcher
-    agent = LenderMatcherAgent()
-    agent.process(loan)
+    # Auto run matcher (tác vụ nền)
+    match_lenders_task.delay([loan.id])
 
     return JsonResponse({"success": True, "message": "Đơn vay đã được duyệt!"})
 
@@ -90,11 +87,16 @@ def approve_loan(request, loan_id):
 @require_http_methods(["POST"])
 def run_payment_check(request):
     """Admin: Chạy kiểm tra thanh toán"""
-    from .agents import PaymentMonitorAgent
+    from .tasks import send_payment_reminders_task
 
     if not request.user.is_staff:
         return JsonResponse({"success": False, "error": "Không có quyền!"})
 
-    agent = PaymentMonitorAgent()
-    result = agent.process()
-    return JsonResponse(result)
+    task = send_payment_reminders_task.delay()
+    return JsonResponse(
+        {
+            "success": True,
+            "message": "Đã đưa yêu cầu kiểm tra thanh toán vào hàng đợi",
+            "task_id": task.id,
+        }
+    )
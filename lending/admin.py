@@ -1,4 +1,6 @@
 from django.contrib import admin
+
+from src.admin_mixins import CachedChangelistMixin, ChangelistDeferMixin
 from .models import (
     LoanRequest,
     LoanContract,
@@ -21,7 +23,8 @@ class LoanRequestAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     ]
-    list_filter = ["status", "created_at"]
+    list_select_related = ["borrower"]
+    list_filter = ["status", ("created_at", admin.DateFieldListFilter)]
     search_fields = ["borrower__username", "purpose"]
     readonly_fields = ["created_at"]
 
@@ -29,14 +32,15 @@ class LoanRequestAdmin(admin.ModelAdmin):
 
     @admin.action(description="Duyệt đơn vay đã chọn")
     def approve_loans(self, request, queryset):
-        from ai_agents.agents import LenderMatcherAgent
+        from ai_agents.tasks import match_lenders_task
 
-        agent = LenderMatcherAgent()
-        for loan in queryset.filter(status="PENDING"):
-            loan.status = "APPROVED"
-            loan.save()
-            agent.process(loan)
-        self.message_user(request, f"Đã duyệt {queryset.count()} đơn vay")
+        loan_ids = list(queryset.filter(status="PENDING").values_list("pk", flat=True))
+        LoanRequest.objects.filter(pk__in=loan_ids).update(status="APPROVED")
+        if loan_ids:
+            match_lenders_task.delay(loan_ids)
+        self.message_user(
+            request, f"Đã duyệt {len(loan_ids)} đơn vay, đang tìm người cho vay"
+        )
 
     @admin.action(description="Từ chối đơn vay đã chọn")
     def reject_loans(self, request, queryset):
@@ -45,7 +49,7 @@ class LoanRequestAdmin(admin.ModelAdmin):
 
 
 @admin.register(LoanContract)
-class LoanContractAdmin(admin.ModelAdmin):
+class LoanContractAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = [
         "id",
         "get_borrower",
@@ -55,21 +59,36 @@ class LoanContractAdmin(admin.ModelAdmin):
         "is_disputed",
         "signed_date",
     ]
-    list_filter = ["is_active", "is_disputed", "signed_date"]
+    list_filter = [
+        "is_active",
+        "is_disputed",
+        ("signed_date", admin.DateFieldListFilter),
+    ]
     search_fields = ["loan_request__borrower__username", "lender__username"]
-    readonly_fields = ["signed_date"]
+    # Bộ đếm kỳ hạn do signal / refresh_schedule_counts() duy trì
+    readonly_fields = ["signed_date", "total_schedules", "paid_schedules"]
+    autocomplete_fields = ["loan_request", "borrower", "lender"]
+    changelist_defer = ("contract_text", "contract_content")
+    list_select_related = ["loan_request__borrower", "lender"]
+
+    def get_queryset(self, request):
+        from django.db.models import F
 
-    @admin.display(description="Người vay")
+        return (
+            super().get_queryset(request).annotate(_amount=F("loan_request__amount"))
+        )
+
+    @admin.display(description="Người vay", ordering="loan_request__borrower__username")
     def get_borrower(self, obj):
         return obj.loan_request.borrower.username
 
-    @admin.display(description="Số tiền")
+    @admin.display(description="Số tiền", ordering="_amount")
     def get_amount(self, obj):
-        return f"{obj.loan_request.amount:,.0f} VNĐ"
+        return f"{obj._amount:,.0f} VNĐ"
 
 
 @admin.register(RepaymentSchedule)
-class RepaymentScheduleAdmin(admin.ModelAdmin):
+class RepaymentScheduleAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = [
         "id",
         "contract",
@@ -79,29 +98,57 @@ class RepaymentScheduleAdmin(admin.ModelAdmin):
         "paid_date",
         "reminder_sent",
     ]
-    list_filter = ["is_paid", "reminder_sent", "due_date"]
+    list_filter = [("due_date", admin.DateFieldListFilter), "is_paid", "reminder_sent"]
     search_fields = ["contract__loan_request__borrower__username"]
+    autocomplete_fields = ["contract"]
+    list_select_related = ["contract"]
+    changelist_defer = ("contract__contract_text", "contract__contract_content")
 
     actions = ["mark_as_paid", "send_reminders"]
 
     @admin.action(description="Đánh dấu đã thanh toán")
     def mark_as_paid(self, request, queryset):
+        from django.db import connection
         from django.utils import timezone
 
-        queryset.update(is_paid=True, paid_date=timezone.now().date())
-        self.message_user(request, f"Đã cập nhật {queryset.count()} kỳ hạn")
+        today = timezone.now().date()
+        contract_ids = list(
+            queryset.values_list("contract_id", flat=True).distinct()
+        )
+        if connection.vendor == "postgresql":
+            # Truyền danh sách id dưới dạng một mảng thay vì mệnh đề IN dài
+            ids = list(queryset.values_list("pk", flat=True))
+            table = connection.ops.quote_name(queryset.model._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET is_paid = true, paid_date = %s "
+                    "WHERE id = ANY(%s)",
+                    [today, ids],
+                )
+                updated = cursor.rowcount
+        else:
+            updated = queryset.update(is_paid=True, paid_date=today)
+        LoanContract.objects.filter(pk__in=contract_ids).refresh_schedule_counts()
+        self.message_user(request, f"Đã cập nhật {updated} kỳ hạn")
 
     @admin.action(description="Gửi nhắc nhở")
     def send_reminders(self, request, queryset):
-        from ai_agents.agents import PaymentMonitorAgent
+        from ai_agents.tasks import send_payment_reminders_task
 
-        agent = PaymentMonitorAgent()
-        agent.process()
-        self.message_user(request, "Đã gửi nhắc nhở")
+        contract_ids = list(
+            queryset.filter(is_paid=False)
+            .values_list("contract_id", flat=True)
+            .distinct()
+        )
+        if contract_ids:
+            send_payment_reminders_task.delay(contract_ids)
+        self.message_user(
+            request, f"Đã xếp lịch gửi nhắc nhở cho {len(contract_ids)} hợp đồng"
+        )
 
 
 @admin.register(Dispute)
-class DisputeAdmin(admin.ModelAdmin):
+class DisputeAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = [
         "id",
         "contract",
@@ -110,9 +157,18 @@ class DisputeAdmin(admin.ModelAdmin):
         "status",
         "created_at",
     ]
-    list_filter = ["status", "dispute_type", "created_at"]
+    list_filter = ["status", "dispute_type", ("created_at", admin.DateFieldListFilter)]
     search_fields = ["contract__loan_request__borrower__username", "description"]
     readonly_fields = ["created_at", "resolved_at", "ai_analysis", "ai_recommendation"]
+    autocomplete_fields = ["contract", "complainant", "respondent", "raised_by"]
+    list_select_related = ["contract", "raised_by"]
+    changelist_defer = (
+        "ai_analysis",
+        "ai_recommendation",
+        "resolution_notes",
+        "contract__contract_text",
+        "contract__contract_content",
+    )
 
     actions = ["resolve_disputes", "run_ai_analysis"]
 
@@ -125,16 +181,17 @@ class DisputeAdmin(admin.ModelAdmin):
 
     @admin.action(description="Chạy AI phân tích")
     def run_ai_analysis(self, request, queryset):
-        from ai_agents.agents import DisputeResolverAgent
+        from ai_agents.tasks import analyze_disputes_task
 
-        agent = DisputeResolverAgent()
-        for dispute in queryset:
-            agent.process(dispute)
-        self.message_user(request, f"Đã phân tích {queryset.count()} tranh chấp")
+        dispute_ids = list(queryset.values_list("pk", flat=True))
+        analyze_disputes_task.delay(dispute_ids)
+        self.message_user(
+            request, f"Đã xếp lịch phân tích {len(dispute_ids)} tranh chấp"
+        )
 
 
 @admin.register(LenderProfile)
-class LenderProfileAdmin(admin.ModelAdmin):
+class LenderProfileAdmin(CachedChangelistMixin, admin.ModelAdmin):
     list_display = [
         "user",
         "min_amount",
@@ -146,10 +203,14 @@ class LenderProfileAdmin(admin.ModelAdmin):
     ]
     list_filter = ["is_active", "risk_tolerance"]
     search_fields = ["user__username"]
+    list_select_related = ["user"]
+    changelist_updated_field = "updated_at"
 
 
 @admin.register(BorrowerRiskProfile)
-class BorrowerRiskProfileAdmin(admin.ModelAdmin):
+class BorrowerRiskProfileAdmin(
+    CachedChangelistMixin, ChangelistDeferMixin, admin.ModelAdmin
+):
     list_display = [
         "user",
         "credit_score",
@@ -161,10 +222,13 @@ class BorrowerRiskProfileAdmin(admin.ModelAdmin):
     list_filter = ["risk_level"]
     search_fields = ["user__username"]
     readonly_fields = ["last_updated", "ai_analysis"]
+    list_select_related = ["user"]
+    changelist_defer = ("ai_analysis",)
+    changelist_updated_field = "last_updated"
 
 
 @admin.register(LenderMatchResult)
-class LenderMatchResultAdmin(admin.ModelAdmin):
+class LenderMatchResultAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = [
         "id",
         "loan_request",
@@ -175,6 +239,14 @@ class LenderMatchResultAdmin(admin.ModelAdmin):
         "is_interested",
         "created_at",
     ]
-    list_filter = ["is_notified", "is_viewed", "is_interested", "created_at"]
+    list_filter = [
+        "is_notified",
+        "is_viewed",
+        "is_interested",
+        ("created_at", admin.DateFieldListFilter),
+    ]
     search_fields = ["loan_request__borrower__username", "lender__username"]
     readonly_fields = ["created_at", "match_reasons"]
+    autocomplete_fields = ["loan_request", "lender"]
+    list_select_related = ["loan_request__borrower", "lender"]
+    changelist_defer = ("match_reasons", "loan_request__purpose")
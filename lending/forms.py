@@ -0,0 +1,39 @@
+"""
+Forms cho Lending app - Parse và validate dữ liệu POST một lần
+"""
+
+from decimal import Decimal
+
+from django import forms
+
+from .models import LenderProfile
+
+
+class LoanRequestForm(forms.Form):
+    """Dữ liệu tạo đơn vay"""
+
+    amount = forms.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        min_value=Decimal("1000000"),
+        error_messages={"min_value": "Số tiền vay tối thiểu 1,000,000 VNĐ!"},
+    )
+    interest_rate = forms.FloatField(min_value=0)
+    duration_months = forms.IntegerField(min_value=1)
+    purpose = forms.CharField(required=False)
+
+
+class LenderProfileForm(forms.ModelForm):
+    """Tiêu chí đầu tư của người cho vay"""
+
+    class Meta:
+        model = LenderProfile
+        fields = [
+            "min_amount",
+            "max_amount",
+            "min_interest_rate",
+            "preferred_duration_min",
+            "preferred_duration_max",
+            "risk_tolerance",
+            "is_active",
+        ]
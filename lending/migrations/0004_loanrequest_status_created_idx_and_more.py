@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-16 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lending', '0003_dispute_complainant_dispute_penalty_amount_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loanrequest',
+            index=models.Index(fields=['status', 'created_at'], name='loanreq_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repaymentschedule',
+            index=models.Index(fields=['is_paid', 'due_date'], name='repay_paid_due_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-16 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lending', '0005_lenderprofile_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(fields=['status', '-created_at'], name='dispute_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='lendermatchresult',
+            index=models.Index(fields=['is_notified', 'is_viewed', '-created_at'], name='match_notified_viewed_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-16 10:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lending', '0006_dispute_status_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='paymentschedule',
+            index=models.Index(fields=['status', 'due_date'], name='payschedule_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='paymenttransaction',
+            index=models.Index(fields=['contract', 'status'], name='paytxn_contract_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(fields=['contract', 'status'], name='dispute_contract_status_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.9 on 2026-10-16 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lending', '0007_paymentschedule_payschedule_status_due_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loanrequest',
+            index=models.Index(fields=['borrower', '-created_at'], name='loanreq_borrower_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repaymentschedule',
+            index=models.Index(fields=['contract', 'is_paid'], name='repay_contract_paid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dispute',
+            index=models.Index(fields=['raised_by', '-created_at'], name='dispute_raisedby_created_idx'),
+        ),
+    ]
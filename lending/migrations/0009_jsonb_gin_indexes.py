@@ -0,0 +1,36 @@
+# Chỉ tạo GIN index trên PostgreSQL (jsonb); các backend khác bỏ qua
+
+from django.db import migrations
+
+GIN_INDEXES = [
+    ("riskprofile_ai_analysis_gin", "lending_borrowerriskprofile", "ai_analysis"),
+    ("match_reasons_gin", "lending_lendermatchresult", "match_reasons"),
+]
+
+
+def create_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, table, column in GIN_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {name} ON {table} "
+            f"USING gin ({column} jsonb_path_ops)"
+        )
+
+
+def drop_gin_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table, _column in GIN_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lending', '0008_loanrequest_loanreq_borrower_created_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_gin_indexes, drop_gin_indexes),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.9 on 2026-10-16 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lending', '0009_jsonb_gin_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='loancontract',
+            index=models.Index(fields=['lender', '-signed_date'], name='contract_lender_signed_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='repaymentschedule',
+            index=models.Index(fields=['contract', 'due_date'], name='repay_contract_due_idx'),
+        ),
+    ]
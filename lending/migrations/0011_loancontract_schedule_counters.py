@@ -0,0 +1,46 @@
+# Generated by Django 5.2.9 on 2026-10-16 15:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_schedule_counts(apps, schema_editor):
+    LoanContract = apps.get_model('lending', 'LoanContract')
+    RepaymentSchedule = apps.get_model('lending', 'RepaymentSchedule')
+
+    schedules = (
+        RepaymentSchedule.objects.filter(contract=OuterRef('pk'))
+        .order_by()
+        .values('contract')
+    )
+    LoanContract.objects.update(
+        total_schedules=Coalesce(
+            Subquery(schedules.annotate(n=Count('pk')).values('n')), 0
+        ),
+        paid_schedules=Coalesce(
+            Subquery(schedules.filter(is_paid=True).annotate(n=Count('pk')).values('n')),
+            0,
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lending', '0010_loancontract_contract_lender_signed_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='loancontract',
+            name='paid_schedules',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='loancontract',
+            name='total_schedules',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_schedule_counts, migrations.RunPython.noop),
+    ]
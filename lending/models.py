@@ -24,10 +24,49 @@ class LoanRequest(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="PENDING")
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "created_at"], name="loanreq_status_created_idx"
+            ),
+            models.Index(
+                fields=["borrower", "-created_at"], name="loanreq_borrower_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Vay {self.amount} - {self.borrower.username}"
 
 
+class LoanContractQuerySet(models.QuerySet):
+    def refresh_schedule_counts(self):
+        """
+        Tính lại bộ đếm kỳ hạn (tổng / đã trả) từ RepaymentSchedule (luồng cũ)
+        và PaymentSchedule (luồng ContractGeneratorAgent mới)
+        """
+        from django.db.models import Count, OuterRef, Subquery
+        from django.db.models.functions import Coalesce
+
+        def count(queryset):
+            return Coalesce(
+                Subquery(
+                    queryset.filter(contract=OuterRef("pk"))
+                    .order_by()
+                    .values("contract")
+                    .annotate(n=Count("pk"))
+                    .values("n")
+                ),
+                0,
+            )
+
+        return self.update(
+            total_schedules=count(RepaymentSchedule.objects.all())
+            + count(PaymentSchedule.objects.all()),
+            paid_schedules=count(RepaymentSchedule.objects.filter(is_paid=True))
+            + count(PaymentSchedule.objects.filter(status="PAID")),
+        )
+
+
 class LoanContract(models.Model):
     """Hợp đồng vay chính thức (Kết quả của Agent Contract Generator)"""
 
@@ -83,6 +122,19 @@ class LoanContract(models.Model):
     is_active = models.BooleanField(default=True)
     is_disputed = models.BooleanField(default=False)  # Có đang tranh chấp không?
 
+    # Bộ đếm kỳ hạn (RepaymentSchedule) để hiển thị tiến độ không cần COUNT
+    total_schedules = models.PositiveIntegerField(default=0)
+    paid_schedules = models.PositiveIntegerField(default=0)
+
+    objects = LoanContractQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["lender", "-signed_date"], name="contract_lender_signed_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Contract #{self.contract_number or self.id}"
 
@@ -104,10 +156,27 @@ class RepaymentSchedule(models.Model):
     paid_date = models.DateField(null=True, blank=True)
     reminder_sent = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_paid", "due_date"], name="repay_paid_due_idx"),
+            models.Index(
+                fields=["contract", "is_paid"], name="repay_contract_paid_idx"
+            ),
+            models.Index(
+                fields=["contract", "due_date"], name="repay_contract_due_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Kỳ hạn {self.due_date} - {self.amount_due}"
 
 
+class PaymentScheduleQuerySet(models.QuerySet):
+    def with_related(self):
+        """Nạp sẵn hợp đồng và hai bên vay/cho vay"""
+        return self.select_related("contract__borrower", "contract__lender")
+
+
 class PaymentSchedule(models.Model):
     """Lịch thanh toán chi tiết"""
 
@@ -144,14 +213,27 @@ class PaymentSchedule(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = PaymentScheduleQuerySet.as_manager()
+
     class Meta:
         ordering = ["contract", "installment_number"]
         unique_together = ["contract", "installment_number"]
+        indexes = [
+            models.Index(
+                fields=["status", "due_date"], name="payschedule_status_due_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"Payment #{self.installment_number} - Contract #{self.contract_id}"
 
 
+class PaymentTransactionQuerySet(models.QuerySet):
+    def with_related(self):
+        """Nạp sẵn hợp đồng, kỳ thanh toán, người trả và người nhận"""
+        return self.select_related("contract", "payment_schedule", "payer", "recipient")
+
+
 class PaymentTransaction(models.Model):
     """Giao dịch thanh toán"""
 
@@ -205,6 +287,15 @@ class PaymentTransaction(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = PaymentTransactionQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["contract", "status"], name="paytxn_contract_status_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Transaction #{self.id} - {self.amount}"
 
@@ -282,10 +373,29 @@ class Dispute(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     resolved_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "-created_at"], name="dispute_status_created_idx"
+            ),
+            models.Index(
+                fields=["contract", "status"], name="dispute_contract_status_idx"
+            ),
+            models.Index(
+                fields=["raised_by", "-created_at"], name="dispute_raisedby_created_idx"
+            ),
+        ]
+
     def __str__(self):
         return f"Tranh chấp #{self.id} - {self.dispute_type}"
 
 
+class DisputeEvidenceQuerySet(models.QuerySet):
+    def with_related(self):
+        """Nạp sẵn tranh chấp và người nộp bằng chứng"""
+        return self.select_related("dispute", "submitted_by")
+
+
 class DisputeEvidence(models.Model):
     """Bằng chứng cho tranh chấp"""
 
@@ -307,6 +417,8 @@ class DisputeEvidence(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = DisputeEvidenceQuerySet.as_manager()
+
     def __str__(self):
         return f"Evidence #{self.id} for Dispute #{self.dispute_id}"
 
@@ -347,6 +459,7 @@ class LenderProfile(models.Model):
 
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Lender: {self.user.username}"
@@ -412,6 +525,12 @@ class LenderMatchResult(models.Model):
     class Meta:
         unique_together = ["loan_request", "lender"]
         ordering = ["-match_score"]
+        indexes = [
+            models.Index(
+                fields=["is_notified", "is_viewed", "-created_at"],
+                name="match_notified_viewed_idx",
+            ),
+        ]
 
     def __str__(self):
-        return f"Match: Loan #{self.loan_request.id} - {self.lender.username} ({self.match_score}%)"
+        return f"Match: Loan #{self.loan_request_id} - {self.lender.username} ({self.match_score}%)"
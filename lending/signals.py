@@ -0,0 +1,17 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import LoanContract, PaymentSchedule, RepaymentSchedule
+
+
+@receiver(post_save, sender=RepaymentSchedule)
+@receiver(post_delete, sender=RepaymentSchedule)
+@receiver(post_save, sender=PaymentSchedule)
+@receiver(post_delete, sender=PaymentSchedule)
+def refresh_contract_schedule_counts(sender, instance, **kwargs):
+    """
+    Kỳ hạn được thêm / sửa / xóa từng dòng (admin, agent) thì tính lại bộ đếm
+    của hợp đồng. bulk_create / queryset.update() không phát signal nên nơi gọi
+    tự gọi refresh_schedule_counts()
+    """
+    LoanContract.objects.filter(pk=instance.contract_id).refresh_schedule_counts()
@@ -1,3 +1,124 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+
+from ai_agents.agents.contract_generator_new import calculate_loan_schedule_raw
+from ai_agents.services.matching import loan_matching
+
+from .models import BorrowerRiskProfile, LenderProfile, LoanRequest
+
+
+def _legacy_equal_principal_schedule(principal, interest_rate, duration_months):
+    """Vòng lặp trả gốc đều cũ, giữ lại làm chuẩn để so sánh"""
+    monthly_rate = interest_rate / 100 / 12
+    schedule = []
+    remaining = principal
+    total_interest = 0
+    total_payment = 0
+
+    principal_payment = principal / duration_months
+    for month in range(1, duration_months + 1):
+        interest = remaining * monthly_rate
+        payment = principal_payment + interest
+        remaining -= principal_payment
+
+        schedule.append(
+            {
+                "month": month,
+                "principal_payment": round(principal_payment, 0),
+                "interest_payment": round(interest, 0),
+                "total_payment": round(payment, 0),
+                "remaining_balance": max(0, round(remaining, 0)),
+            }
+        )
+
+        total_interest += interest
+        total_payment += payment
+
+    return {
+        "total_interest": round(total_interest, 0),
+        "total_payment": round(total_payment, 0),
+        "schedule": schedule,
+    }
+
+
+class EqualPrincipalScheduleTests(SimpleTestCase):
+    """Lịch trả gốc đều phải khớp từng đồng với vòng lặp cũ"""
+
+    CASES = [
+        (principal, rate, months)
+        for principal in (1_000_000, 3_000_000, 12_345_678, 50_000_000)
+        for rate in (0, 8, 12.5, 15, 24)
+        for months in (1, 6, 7, 12, 24, 36)
+    ]
+
+    def test_matches_legacy_loop(self):
+        for principal, rate, months in self.CASES:
+            with self.subTest(principal=principal, rate=rate, months=months):
+                expected = _legacy_equal_principal_schedule(
+                    float(principal), float(rate), months
+                )
+                result = calculate_loan_schedule_raw(
+                    float(principal), float(rate), months
+                )
+
+                self.assertEqual(result["schedule"], expected["schedule"])
+                self.assertEqual(result["total_interest"], expected["total_interest"])
+                self.assertEqual(result["total_payment"], expected["total_payment"])
+
+
+class MatchScoreExpressionTests(TestCase):
+    """Điểm tính bằng SQL phải bằng điểm tính bằng Python cho mọi cặp loan/lender"""
+
+    @classmethod
+    def setUpTestData(cls):
+        borrowers = []
+        for i, risk_level in enumerate(["LOW", "MEDIUM", "VERY_HIGH", None]):
+            borrower = User.objects.create_user(f"borrower{i}", password="x")
+            if risk_level:
+                BorrowerRiskProfile.objects.create(user=borrower, risk_level=risk_level)
+            borrowers.append(borrower)
+
+        # (số tiền, lãi suất, kỳ hạn): trong khoảng, dưới khoảng, trên khoảng
+        loan_terms = [
+            (Decimal("10000000"), 12.0, 12),
+            (Decimal("2500000"), 8.5, 3),
+            (Decimal("150000000"), 4.0, 36),
+            (Decimal("75000000"), 11.2, 14),
+        ]
+        for borrower in borrowers:
+            for amount, rate, months in loan_terms:
+                LoanRequest.objects.create(
+                    borrower=borrower,
+                    amount=amount,
+                    interest_rate=rate,
+                    duration_months=months,
+                    purpose="Test",
+                    status="APPROVED",
+                )
+
+        for i, tolerance in enumerate(["LOW", "MEDIUM", "HIGH"]):
+            LenderProfile.objects.create(
+                user=User.objects.create_user(f"lender{i}", password="x"),
+                min_amount=Decimal("5000000"),
+                max_amount=Decimal("50000000"),
+                min_interest_rate=10.0 + i,
+                preferred_duration_min=6,
+                preferred_duration_max=12,
+                risk_tolerance=tolerance,
+            )
+
+    def test_sql_score_matches_python_score(self):
+        for lender in LenderProfile.objects.all():
+            loans = LoanRequest.objects.select_related(
+                "borrower__risk_profile"
+            ).annotate(sql_score=loan_matching.match_score_expression(lender))
+
+            for loan in loans:
+                with self.subTest(lender=lender.risk_tolerance, loan=loan.pk):
+                    self.assertAlmostEqual(
+                        float(loan.sql_score),
+                        loan_matching._calculate_match_score(loan, lender),
+                        places=6,
+                    )
@@ -2,14 +2,149 @@
 Views cho Lending app - Quản lý vay/cho vay
 """
 
-from decimal import Decimal
+import hashlib
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
+from django.utils import timezone
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.paginator import Paginator
 from django.http import JsonResponse
-from django.views.decorators.http import require_http_methods
+from django.db import DatabaseError, transaction
+from django.db.models import (
+    Count,
+    F,
+    FloatField,
+    JSONField,
+    Max,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Sum,
+)
+from django.db.models.functions import Coalesce
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag, require_http_methods
+from django.views.decorators.vary import vary_on_cookie
+
+from user.models import UserProfile
+from user.services import invalidate_cached_profile
+from .forms import LenderProfileForm, LoanRequestForm
+from .models import (
+    LoanRequest,
+    LoanContract,
+    RepaymentSchedule,
+    Dispute,
+    LenderProfile,
+    LenderMatchResult,
+)
+
+
+def _aggregate_etag(request, *aggregates):
+    """
+    ETag cho trang danh sách: hash theo đường dẫn (gồm số trang), người dùng,
+    CSRF cookie và các giá trị tổng hợp (Count/Max/Sum) của dữ liệu, tính bằng
+    truy vấn aggregate thay vì đọc lại toàn bộ các dòng.
+    Không trả ETag khi có thông báo chờ hiển thị.
+    """
+    if len(messages.get_messages(request)):
+        return None
+    raw = "|".join(
+        [
+            request.get_full_path(),
+            str(request.user.pk),
+            request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+            *(
+                f"{key}={value}"
+                for result in aggregates
+                for key, value in sorted(result.items())
+            ),
+        ]
+    )
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _my_loans_etag(request):
+    # Đơn vay không có updated_at: số đơn theo từng trạng thái phản ánh việc
+    # duyệt / giải ngân
+    return _aggregate_etag(
+        request,
+        LoanRequest.objects.filter(borrower_id=request.user.pk).aggregate(
+            last_created=Max("created_at"),
+            **{
+                status: Count("id", filter=Q(status=status))
+                for status, _ in LoanRequest.STATUS_CHOICES
+            },
+        ),
+    )
+
+
+def _browse_loans_etag(request):
+    return _aggregate_etag(
+        request,
+        LoanRequest.objects.filter(status="APPROVED")
+        .exclude(borrower_id=request.user.pk)
+        .aggregate(
+            total=Count("id"),
+            last_id=Max("id"),
+            risk_updated=Max("borrower__risk_profile__last_updated"),
+        ),
+        LenderProfile.objects.filter(user_id=request.user.pk).aggregate(
+            profile_updated=Max("updated_at")
+        ),
+        LenderMatchResult.objects.filter(lender_id=request.user.pk).aggregate(
+            matches=Count("id"), last_match=Max("created_at")
+        ),
+    )
+
+
+def _my_investments_etag(request):
+    return _aggregate_etag(
+        request,
+        LoanContract.objects.filter(lender_id=request.user.pk).aggregate(
+            total=Count("id"),
+            last_signed=Max("signed_date"),
+            active=Count("id", filter=Q(is_active=True)),
+            disputed=Count("id", filter=Q(is_disputed=True)),
+            paid_schedules=Sum("paid_schedules"),
+        ),
+    )
+
+
+def _my_disputes_etag(request):
+    return _aggregate_etag(
+        request,
+        Dispute.objects.filter(raised_by_id=request.user.pk).aggregate(
+            total=Count("id"), last_updated=Max("updated_at")
+        ),
+    )
+
+
+# Trang danh sách theo người dùng: trình duyệt luôn hỏi lại máy chủ (no-cache)
+# để thấy ngay thay đổi sau khi đầu tư / tạo đơn, và nhận 304 khi không đổi
+def _private_list_page(etag_func):
+    def decorator(view):
+        return cache_control(private=True, no_cache=True)(
+            vary_on_cookie(etag(etag_func)(view))
+        )
+
+    return decorator
 
-from .models import LoanRequest, LoanContract, RepaymentSchedule, Dispute, LenderProfile
+
+LIST_PAGE_SIZE = 25
+
+
+def _form_errors_to_messages(request, form):
+    """Hiển thị lỗi validate của form qua messages (template không render form)"""
+    for errors in form.errors.values():
+        for error in errors:
+            messages.error(request, error)
+
+
+def _get_page(request, queryset):
+    """Phân trang danh sách, chỉ nạp các dòng của trang hiện tại"""
+    return Paginator(queryset, LIST_PAGE_SIZE).get_page(request.GET.get("page"))
 
 
 # ========== BORROWER VIEWS ==========
@@ -19,58 +154,31 @@ from .models import LoanRequest, LoanContract, RepaymentSchedule, Dispute, Lende
 def create_loan_request(request):
     """Tạo đơn vay mới"""
     if request.method == "POST":
-        # Check KYC
-        if (
-            not hasattr(request.user, "profile")
-            or request.user.profile.kyc_status != "VERIFIED"
-        ):
+        # Check KYC (một truy vấn EXISTS, không cần nạp profile)
+        if not UserProfile.objects.filter(
+            user_id=request.user.id, kyc_status="VERIFIED"
+        ).exists():
             messages.error(request, "Vui lòng hoàn thành KYC trước khi vay!")
             return redirect("user:kyc")
 
-        amount = Decimal(request.POST.get("amount", 0))
-        interest_rate = float(request.POST.get("interest_rate", 12))
-        duration_months = int(request.POST.get("duration_months", 6))
-        purpose = request.POST.get("purpose", "")
-
-        if amount < 1000000:
-            messages.error(request, "Số tiền vay tối thiểu 1,000,000 VNĐ!")
+        form = LoanRequestForm(request.POST)
+        if not form.is_valid():
+            _form_errors_to_messages(request, form)
             return render(request, "lending/create_loan.html")
 
         loan = LoanRequest.objects.create(
-            borrower=request.user,
-            amount=amount,
-            interest_rate=interest_rate,
-            duration_months=duration_months,
-            purpose=purpose,
-            status="PENDING",
+            borrower=request.user, status="PENDING", **form.cleaned_data
         )
 
-        # Run AI profiler
-        from ai_agents.agents import BorrowerProfilerAgent
-
-        agent = BorrowerProfilerAgent()
-        result = agent.process(request.user, loan)
-
-        # Nếu khoản vay được duyệt, tìm lender phù hợp và thông báo
-        if loan.status == "APPROVED":
-            from ai_agents.services.matching import loan_matching
-
-            lender_count = loan_matching.notify_matching_lenders(loan)
-
-            if lender_count > 0:
-                loan_matching.notify_borrower_has_match(loan, lender_count)
-                messages.success(
-                    request,
-                    f"Đơn vay đã được duyệt! Có {lender_count} người cho vay phù hợp đã được thông báo.",
-                )
-            else:
-                loan_matching.notify_borrower_no_match(loan)
-                messages.success(
-                    request,
-                    "Đơn vay đã được duyệt! Hệ thống sẽ thông báo khi có người cho vay phù hợp.",
-                )
-        else:
-            messages.success(request, "Đơn vay đã được tạo! Đang chờ duyệt.")
+        # Chạy AI profiler và matching ở background, kết quả gửi qua thông báo
+        from ai_agents.tasks import profile_loan_request_task
+
+        profile_loan_request_task.delay(loan.id)
+        messages.success(
+            request,
+            "Đơn vay đã được tạo! Hệ thống đang đánh giá hồ sơ, "
+            "bạn sẽ nhận thông báo khi có kết quả.",
+        )
 
         return redirect("lending:my_loans")
 
@@ -78,29 +186,48 @@ def create_loan_request(request):
 
 
 @login_required
+@_private_list_page(_my_loans_etag)
 def my_loans(request):
     """Danh sách đơn vay của tôi"""
-    loans = LoanRequest.objects.filter(borrower=request.user).order_by("-created_at")
-    return render(request, "lending/my_loans.html", {"loans": loans})
+    loans = (
+        LoanRequest.objects.filter(borrower=request.user)
+        .only(
+            "id", "amount", "interest_rate", "duration_months", "status", "created_at"
+        )
+        .order_by("-created_at")
+    )
+    page_obj = _get_page(request, loans)
+    return render(
+        request, "lending/my_loans.html", {"loans": page_obj, "page_obj": page_obj}
+    )
 
 
 @login_required
 def loan_detail(request, loan_id):
     """Chi tiết đơn vay"""
-    loan = get_object_or_404(LoanRequest, id=loan_id)
+    loan = get_object_or_404(
+        LoanRequest.objects.select_related(
+            "borrower", "loancontract__lender"
+        ).prefetch_related(
+            Prefetch(
+                "loancontract__schedules",
+                queryset=RepaymentSchedule.objects.order_by("due_date"),
+                to_attr="ordered_schedules",
+            )
+        ),
+        id=loan_id,
+    )
+    contract = getattr(loan, "loancontract", None)
 
     # Check permission
-    is_borrower = loan.borrower == request.user
-    is_lender = (
-        hasattr(loan, "loancontract") and loan.loancontract.lender == request.user
-    )
+    is_borrower = loan.borrower_id == request.user.id
+    is_lender = contract is not None and contract.lender_id == request.user.id
 
     if not is_borrower and not is_lender:
         messages.error(request, "Bạn không có quyền xem đơn vay này!")
         return redirect("user:dashboard")
 
-    contract = getattr(loan, "loancontract", None)
-    schedules = contract.schedules.all() if contract else []
+    schedules = contract.ordered_schedules if contract else []
 
     return render(
         request,
@@ -121,49 +248,56 @@ def loan_detail(request, loan_id):
 @login_required
 def lender_profile_view(request):
     """Cấu hình profile người cho vay"""
-    profile, created = LenderProfile.objects.get_or_create(user=request.user)
-
     if request.method == "POST":
-        profile.min_amount = Decimal(request.POST.get("min_amount", 1000000))
-        profile.max_amount = Decimal(request.POST.get("max_amount", 100000000))
-        profile.min_interest_rate = float(request.POST.get("min_interest_rate", 8))
-        profile.preferred_duration_min = int(
-            request.POST.get("preferred_duration_min", 1)
-        )
-        profile.preferred_duration_max = int(
-            request.POST.get("preferred_duration_max", 24)
-        )
-        profile.risk_tolerance = request.POST.get("risk_tolerance", "MEDIUM")
-        profile.is_active = request.POST.get("is_active") == "on"
-        profile.save()
-
-        # Tìm và thông báo các khoản vay phù hợp
+        # Khóa profile trong transaction để hai lần lưu đồng thời không ghi đè
+        # lẫn nhau hoặc tạo trùng
+        with transaction.atomic():
+            profile = (
+                LenderProfile.objects.select_for_update()
+                .filter(user=request.user)
+                .first()
+            )
+            if profile is None:
+                profile, _ = LenderProfile.objects.get_or_create(user=request.user)
+
+            form = LenderProfileForm(request.POST, instance=profile)
+            if not form.is_valid():
+                _form_errors_to_messages(request, form)
+                return redirect("lending:lender_profile")
+
+            profile = form.save(commit=False)
+            profile.save(update_fields=[*LenderProfileForm.Meta.fields, "updated_at"])
+
+        # Tính lại điểm phù hợp và thông báo các khoản vay phù hợp ở tác vụ nền
         if profile.is_active:
-            from ai_agents.services.matching import loan_matching
-
-            loan_count = loan_matching.notify_matching_loans(profile)
-
-            if loan_count > 0:
-                messages.success(
-                    request,
-                    f"Cập nhật thành công! Tìm thấy {loan_count} khoản vay phù hợp.",
-                )
-            else:
-                messages.success(
-                    request,
-                    "Cập nhật thành công! Chưa có khoản vay phù hợp, hệ thống sẽ thông báo khi có.",
-                )
+            from ai_agents.tasks import compute_matches_for_lender
+
+            compute_matches_for_lender.delay(profile.user_id)
+            messages.success(
+                request,
+                "Cập nhật thành công! Hệ thống đang tìm các khoản vay phù hợp "
+                "và sẽ thông báo cho bạn.",
+            )
         else:
             messages.success(request, "Cập nhật thành công!")
 
         return redirect("lending:lender_profile")
 
+    # GET chỉ đọc: chưa có profile thì hiển thị tiêu chí mặc định (chưa lưu),
+    # profile được tạo ở lần lưu đầu tiên
+    profile = LenderProfile.objects.filter(user=request.user).first()
+
     # Lấy danh sách khoản vay phù hợp để hiển thị
     matching_loans = []
-    if profile.is_active:
+    if profile is None:
         from ai_agents.services.matching import loan_matching
 
+        profile = LenderProfile(user=request.user)
         matching_loans = loan_matching.find_matching_loans(profile)[:10]
+    elif profile.is_active:
+        from ai_agents.services.matching import loan_matching
+
+        matching_loans = loan_matching.get_cached_matching_loans(profile)
 
     return render(
         request,
@@ -173,110 +307,154 @@ def lender_profile_view(request):
 
 
 @login_required
+@_private_list_page(_browse_loans_etag)
 def browse_loans(request):
     """Duyệt danh sách đơn vay có thể đầu tư"""
-    loans = LoanRequest.objects.filter(status="APPROVED").exclude(borrower=request.user)
-
-    # Tính match score cho mỗi loan
-    matching_loans = []
+    loans = (
+        LoanRequest.objects.filter(status="APPROVED")
+        .exclude(borrower=request.user)
+        .select_related("borrower")
+        .only(
+            "id",
+            "amount",
+            "interest_rate",
+            "duration_months",
+            "purpose",
+            "created_at",
+            "borrower",
+            "borrower__username",
+        )
+    )
 
-    if hasattr(request.user, "lender_profile"):
+    lp = LenderProfile.objects.filter(user=request.user).first()
+    if lp is not None:
         from ai_agents.services.matching import loan_matching
 
-        lp = request.user.lender_profile
-
-        # Lấy loans phù hợp với match score
-        matches = loan_matching.find_matching_loans(lp)
-
-        # Tạo dict để lookup nhanh
-        match_dict = {m["loan"].id: m for m in matches}
-
-        for loan in loans:
-            if loan.id in match_dict:
-                matching_loans.append(
-                    {
-                        "loan": loan,
-                        "match_score": match_dict[loan.id]["match_score"],
-                        "reasons": match_dict[loan.id]["reasons"],
-                    }
-                )
-            else:
-                matching_loans.append({"loan": loan, "match_score": 0, "reasons": []})
-
-        # Sắp xếp theo match score
-        matching_loans.sort(key=lambda x: x["match_score"], reverse=True)
+        # Điểm phù hợp đã lưu trong LenderMatchResult; khoản vay chưa được chấm
+        # thì tính bằng biểu thức SQL. Sắp xếp hoàn toàn trong DB
+        match = LenderMatchResult.objects.filter(
+            loan_request=OuterRef("pk"), lender=request.user
+        )
+        loans = loans.annotate(
+            match_score=Coalesce(
+                Subquery(match.values("match_score")[:1]),
+                loan_matching.match_score_expression(lp),
+                output_field=FloatField(),
+            ),
+            match_reasons=Subquery(
+                match.values("match_reasons")[:1], output_field=JSONField()
+            ),
+        ).order_by("-match_score", "-created_at")
+
+        page_obj = _get_page(request, loans)
+        matching_loans = [
+            {
+                "loan": loan,
+                "match_score": loan.match_score,
+                "reasons": loan.match_reasons or [],
+            }
+            for loan in page_obj
+        ]
     else:
         # Không có lender profile, hiển thị tất cả
+        page_obj = _get_page(request, loans.order_by("-created_at"))
         matching_loans = [
-            {"loan": loan, "match_score": None, "reasons": []} for loan in loans
+            {"loan": loan, "match_score": None, "reasons": []} for loan in page_obj
         ]
 
     return render(
-        request, "lending/browse_loans.html", {"matching_loans": matching_loans}
+        request,
+        "lending/browse_loans.html",
+        {"matching_loans": matching_loans, "page_obj": page_obj},
     )
 
 
 @login_required
 def invest_in_loan(request, loan_id):
     """Đầu tư vào đơn vay"""
-    loan = get_object_or_404(LoanRequest, id=loan_id, status="APPROVED")
-
-    if loan.borrower == request.user:
-        return JsonResponse({"success": False, "error": "Không thể tự cho vay!"})
-
-    # Check balance
-    profile = request.user.profile
-    if profile.balance < loan.amount:
-        return JsonResponse({"success": False, "error": "Số dư không đủ!"})
-
-    # Deduct balance
-    profile.balance -= loan.amount
-    profile.save()
-
-    # Add to borrower
-    borrower_profile = loan.borrower.profile
-    borrower_profile.balance += loan.amount
-    borrower_profile.save()
-
-    # Generate contract
-    from ai_agents.agents import ContractGeneratorAgent
+    from ai_agents.agents import contract_generator_agent
+
+    with transaction.atomic():
+        # Khóa đơn vay để hai lender đồng thời không cùng đầu tư một đơn
+        loan = get_object_or_404(
+            LoanRequest.objects.select_for_update(of=("self",)).select_related(
+                "borrower"
+            ),
+            id=loan_id,
+            status="APPROVED",
+        )
 
-    agent = ContractGeneratorAgent()
-    result = agent.process(loan, request.user)
+        if loan.borrower_id == request.user.id:
+            return JsonResponse({"success": False, "error": "Không thể tự cho vay!"})
 
-    if result["success"]:
-        # Update lender stats
-        if hasattr(request.user, "lender_profile"):
-            lp = request.user.lender_profile
-            lp.total_invested += loan.amount
-            lp.active_investments += 1
-            lp.save()
+        # Deduct balance (chỉ trừ khi đủ số dư, phép tính thực hiện trong SQL)
+        debited = UserProfile.objects.filter(
+            user_id=request.user.id, balance__gte=loan.amount
+        ).update(balance=F("balance") - loan.amount)
+        if not debited:
+            return JsonResponse({"success": False, "error": "Số dư không đủ!"})
 
-        return JsonResponse(
-            {
-                "success": True,
-                "message": "Đầu tư thành công!",
-                "contract_id": result["data"]["contract_id"],
-            }
+        # Add to borrower
+        UserProfile.objects.filter(user_id=loan.borrower_id).update(
+            balance=F("balance") + loan.amount
         )
-    else:
-        # Rollback
-        profile.balance += loan.amount
-        profile.save()
-        borrower_profile.balance -= loan.amount
-        borrower_profile.save()
-        return JsonResponse(
-            {"success": False, "error": result.get("error", "Lỗi tạo hợp đồng")}
+        # .update() không phát signal nên tự xóa cache profile (cả sau khi commit)
+        invalidate_cached_profile(request.user.id, loan.borrower_id)
+
+        # Generate contract trong savepoint: lỗi DB bên trong agent chỉ rollback
+        # savepoint, transaction ngoài vẫn dùng được
+        try:
+            with transaction.atomic():
+                result = contract_generator_agent.process(loan, request.user)
+        except DatabaseError as e:
+            result = {"success": False, "error": str(e)}
+
+        if not result["success"]:
+            # Hoàn tác chuyển tiền cùng transaction
+            transaction.set_rollback(True)
+        else:
+            # Update lender stats (cộng dồn trong SQL, không đọc lại profile)
+            LenderProfile.objects.filter(user_id=request.user.id).update(
+                total_invested=F("total_invested") + loan.amount,
+                active_investments=F("active_investments") + 1,
+                updated_at=timezone.now(),
+            )
+
+    if not result["success"]:
+        # Rollback đã xóa AgentLog của lần chạy lỗi: ghi lại sau khi transaction đóng
+        error = result.get("error", "Lỗi tạo hợp đồng")
+        contract_generator_agent.record_failure(
+            loan.borrower,
+            {"loan_request_id": loan.id, "lender_id": request.user.id},
+            error,
         )
+        return JsonResponse({"success": False, "error": error})
+
+    return JsonResponse(
+        {
+            "success": True,
+            "message": "Đầu tư thành công!",
+            "contract_id": result["data"]["contract_id"],
+        }
+    )
 
 
 @login_required
+@_private_list_page(_my_investments_etag)
 def my_investments(request):
     """Danh sách đầu tư của tôi"""
-    investments = LoanContract.objects.filter(lender=request.user).order_by(
-        "-signed_date"
+    investments = (
+        LoanContract.objects.filter(lender=request.user)
+        .select_related("loan_request__borrower")
+        .defer("contract_text", "contract_content", "loan_request__purpose")
+        .order_by("-signed_date")
+    )
+    page_obj = _get_page(request, investments)
+    return render(
+        request,
+        "lending/my_investments.html",
+        {"investments": page_obj, "page_obj": page_obj},
     )
-    return render(request, "lending/my_investments.html", {"investments": investments})
 
 
 # ========== REPAYMENT VIEWS ==========
@@ -285,33 +463,42 @@ def my_investments(request):
 @login_required
 def make_payment(request, schedule_id):
     """Thanh toán kỳ hạn"""
-    schedule = get_object_or_404(RepaymentSchedule, id=schedule_id)
-    contract = schedule.contract
-
-    if contract.loan_request.borrower != request.user:
-        return JsonResponse({"success": False, "error": "Không có quyền!"})
-
-    if schedule.is_paid:
-        return JsonResponse({"success": False, "error": "Kỳ hạn này đã thanh toán!"})
+    from ai_agents.agents import PaymentMonitorAgentLegacy
+
+    with transaction.atomic():
+        # Khóa kỳ hạn để hai request đồng thời không cùng thanh toán một kỳ
+        schedule = get_object_or_404(
+            RepaymentSchedule.objects.select_for_update(of=("self",)).select_related(
+                "contract__loan_request"
+            ),
+            id=schedule_id,
+        )
+        contract = schedule.contract
 
-    # Check balance
-    profile = request.user.profile
-    if profile.balance < schedule.amount_due:
-        return JsonResponse({"success": False, "error": "Số dư không đủ!"})
+        if contract.loan_request.borrower_id != request.user.id:
+            return JsonResponse({"success": False, "error": "Không có quyền!"})
 
-    # Transfer money
-    profile.balance -= schedule.amount_due
-    profile.save()
+        if schedule.is_paid:
+            return JsonResponse(
+                {"success": False, "error": "Kỳ hạn này đã thanh toán!"}
+            )
 
-    lender_profile = contract.lender.profile
-    lender_profile.balance += schedule.amount_due
-    lender_profile.save()
+        # Transfer money: chỉ trừ khi đủ số dư, phép tính thực hiện trong SQL
+        debited = UserProfile.objects.filter(
+            user_id=request.user.id, balance__gte=schedule.amount_due
+        ).update(balance=F("balance") - schedule.amount_due)
+        if not debited:
+            return JsonResponse({"success": False, "error": "Số dư không đủ!"})
 
-    # Mark as paid
-    from ai_agents.agents import PaymentMonitorAgent
+        UserProfile.objects.filter(user_id=contract.lender_id).update(
+            balance=F("balance") + schedule.amount_due
+        )
+        invalidate_cached_profile(request.user.id, contract.lender_id)
 
-    agent = PaymentMonitorAgent()
-    result = agent.mark_payment_completed(schedule_id)
+        # Mark as paid (RepaymentSchedule do agent cũ quản lý)
+        result = PaymentMonitorAgentLegacy().mark_payment_completed(schedule_id)
+        if not result.get("success"):
+            transaction.set_rollback(True)
 
     return JsonResponse(result)
 
@@ -341,11 +528,10 @@ def create_dispute(request, contract_id):
             description=description,
         )
 
-        # Run AI resolver
-        from ai_agents.agents import DisputeResolverAgent
+        # Run AI resolver ở background
+        from ai_agents.tasks import analyze_disputes_task
 
-        agent = DisputeResolverAgent()
-        agent.process(dispute)
+        analyze_disputes_task.delay([dispute.id])
 
         messages.success(request, "Tranh chấp đã được ghi nhận!")
         return redirect("lending:dispute_detail", dispute_id=dispute.id)
@@ -356,10 +542,13 @@ def create_dispute(request, contract_id):
 @login_required
 def dispute_detail(request, dispute_id):
     """Chi tiết tranh chấp"""
-    dispute = get_object_or_404(Dispute, id=dispute_id)
+    dispute = get_object_or_404(
+        Dispute.objects.select_related("contract__loan_request", "raised_by"),
+        id=dispute_id,
+    )
 
-    is_borrower = dispute.contract.loan_request.borrower == request.user
-    is_lender = dispute.contract.lender == request.user
+    is_borrower = dispute.contract.loan_request.borrower_id == request.user.id
+    is_lender = dispute.contract.lender_id == request.user.id
 
     if not is_borrower and not is_lender:
         messages.error(request, "Không có quyền!")
@@ -369,7 +558,17 @@ def dispute_detail(request, dispute_id):
 
 
 @login_required
+@_private_list_page(_my_disputes_etag)
 def my_disputes(request):
     """Danh sách tranh chấp của tôi"""
-    disputes = Dispute.objects.filter(raised_by=request.user).order_by("-created_at")
-    return render(request, "lending/my_disputes.html", {"disputes": disputes})
+    disputes = (
+        Dispute.objects.filter(raised_by=request.user)
+        .only("id", "contract", "dispute_type", "status", "created_at")
+        .order_by("-created_at")
+    )
+    page_obj = _get_page(request, disputes)
+    return render(
+        request,
+        "lending/my_disputes.html",
+        {"disputes": page_obj, "page_obj": page_obj},
+    )
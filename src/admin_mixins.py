@@ -0,0 +1,69 @@
+"""
+Mixin dùng chung cho ModelAdmin của các app (lending, user, ai_agents)
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.http import HttpResponse
+
+
+class ChangelistDeferMixin:
+    """Bỏ qua các cột text/JSON lớn khi hiển thị trang danh sách"""
+
+    changelist_defer = ()
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        match = getattr(request, "resolver_match", None)
+        if (
+            self.changelist_defer
+            and match
+            and (match.url_name or "").endswith("_changelist")
+        ):
+            qs = qs.defer(*self.changelist_defer)
+        return qs
+
+
+class CachedChangelistMixin:
+    """
+    Cache HTML trang danh sách cho các bảng ít thay đổi.
+    Key gồm đường dẫn, người dùng, CSRF cookie và (max thời gian cập nhật, số dòng)
+    để tự hết hạn khi dữ liệu thay đổi.
+    """
+
+    changelist_cache_timeout = 30
+    changelist_updated_field = None
+
+    def changelist_view(self, request, extra_context=None):
+        # Không cache khi có thông báo chờ hiển thị (sau khi chạy action)
+        if request.method != "GET" or len(messages.get_messages(request)):
+            return super().changelist_view(request, extra_context)
+
+        stats = self.model._default_manager.aggregate(
+            last=Max(self.changelist_updated_field), total=Count("pk")
+        )
+        raw = "|".join(
+            [
+                request.get_full_path(),
+                str(request.user.pk),
+                request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+                str(stats["last"]),
+                str(stats["total"]),
+            ]
+        )
+        key = "admin_changelist:{}:{}".format(
+            self.opts.label_lower, hashlib.sha256(raw.encode()).hexdigest()
+        )
+        content = cache.get(key)
+        if content is not None:
+            return HttpResponse(content)
+
+        response = super().changelist_view(request, extra_context)
+        if response.status_code == 200 and hasattr(response, "render"):
+            response.render()
+            cache.set(key, response.content, self.changelist_cache_timeout)
+        return response
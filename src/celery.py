@@ -0,0 +1,13 @@
+"""
+Celery app cho các tác vụ nền (AI agents, nhắc nhở thanh toán, ...)
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "src.settings")
+
+app = Celery("src")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
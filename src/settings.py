@@ -54,6 +54,44 @@ LANGCHAIN_API_KEY = os.getenv("LANGCHAIN_API_KEY", "")
 LANGCHAIN_TRACING_V2 = os.getenv("LANGCHAIN_TRACING_V2", "false")
 LANGCHAIN_PROJECT = os.getenv("LANGCHAIN_PROJECT", "p2p-lending")
 
+# Celery (tác vụ nền cho AI agents)
+CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", CELERY_BROKER_URL)
+# Mặc định gửi tác vụ AI sang worker (cần broker + celery -A src worker).
+# Đặt CELERY_TASK_ALWAYS_EAGER=True để chạy đồng bộ trong request khi phát triển
+CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_TASK_ALWAYS_EAGER", "False") == "True"
+CELERY_TASK_SERIALIZER = "json"
+CELERY_ACCEPT_CONTENT = ["json"]
+# OCR Vintern chạy trên queue riêng chỉ khi CELERY_OCR_QUEUE được đặt (cần worker
+# nghe queue đó, vd: celery -A src worker -Q gpu); mặc định dùng queue "celery"
+CELERY_OCR_QUEUE = os.getenv("CELERY_OCR_QUEUE")
+CELERY_TASK_ROUTES = (
+    {"user.tasks.run_kyc_ocr": {"queue": CELERY_OCR_QUEUE}} if CELERY_OCR_QUEUE else {}
+)
+
+# Cache: dùng Redis khi có REDIS_URL, hoặc dùng chung Redis của Celery broker khi
+# tác vụ chạy trên worker (process khác cần thấy các lần xóa cache của nhau).
+# Chỉ khi không có Redis mới dùng bộ nhớ cục bộ (mỗi process một bản)
+REDIS_URL = os.getenv("REDIS_URL", "")
+if not REDIS_URL and not CELERY_TASK_ALWAYS_EAGER:
+    if CELERY_BROKER_URL.startswith(("redis://", "rediss://")):
+        REDIS_URL = CELERY_BROKER_URL
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+# Cache cục bộ không chia sẻ giữa các process: các service chỉ cache vài giây
+CACHE_IS_SHARED = bool(REDIS_URL)
+
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -88,12 +126,41 @@ WSGI_APPLICATION = "src.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/3.0/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+if DATABASE_URL:
+    from urllib.parse import unquote, urlparse
+
+    _db_url = urlparse(DATABASE_URL)
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": _db_url.path.lstrip("/"),
+            "USER": unquote(_db_url.username or ""),
+            "PASSWORD": unquote(_db_url.password or ""),
+            "HOST": _db_url.hostname or "",
+            "PORT": str(_db_url.port or ""),
+            # Pool kết nối của psycopg 3 (không dùng chung với CONN_MAX_AGE)
+            "OPTIONS": {
+                "pool": {
+                    "min_size": int(os.getenv("DB_POOL_MIN_SIZE", 4)),
+                    "max_size": int(os.getenv("DB_POOL_MAX_SIZE", 20)),
+                    "timeout": 10,
+                },
+            },
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.path.join(BASE_DIR, "db.sqlite3"),
+            # Giữ kết nối giữa các request thay vì mở lại mỗi lần
+            "CONN_MAX_AGE": 600,
+            "CONN_HEALTH_CHECKS": True,
+        }
     }
-}
 
 
 # Password validation
@@ -1,11 +1,15 @@
 from django.contrib import admin
+
+from src.admin_mixins import ChangelistDeferMixin
 from .models import UserProfile, KYCDocument
 
 
 @admin.register(UserProfile)
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = ["user", "full_name", "kyc_status", "balance", "id_card_number"]
     list_filter = ["kyc_status"]
+    list_select_related = ["user"]
+    changelist_defer = ("ocr_data", "kyc_note")
     search_fields = ["user__username", "full_name", "id_card_number"]
     readonly_fields = ["user"]
 
@@ -20,8 +24,10 @@ class UserProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(KYCDocument)
-class KYCDocumentAdmin(admin.ModelAdmin):
+class KYCDocumentAdmin(ChangelistDeferMixin, admin.ModelAdmin):
     list_display = ["user", "doc_type", "uploaded_at"]
     list_filter = ["doc_type", "uploaded_at"]
+    list_select_related = ["user"]
+    changelist_defer = ("ai_extracted_data",)
     search_fields = ["user__username"]
     readonly_fields = ["uploaded_at", "ai_extracted_data"]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.9 on 2026-10-16 15:20
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def remove_duplicate_kyc_documents(apps, schema_editor):
+    """Giữ bản mới nhất cho mỗi (user, doc_type) trước khi thêm ràng buộc unique"""
+    KYCDocument = apps.get_model('user', 'KYCDocument')
+    latest_ids = (
+        KYCDocument.objects.values('user_id', 'doc_type')
+        .annotate(latest_id=Max('id'))
+        .values_list('latest_id', flat=True)
+    )
+    KYCDocument.objects.exclude(id__in=list(latest_ids)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0003_kycdocument_ocr_data_alter_kycdocument_ocr_status'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_kyc_documents, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='kycdocument',
+            constraint=models.UniqueConstraint(fields=('user', 'doc_type'), name='kycdoc_user_doc_type_uniq'),
+        ),
+    ]
@@ -102,5 +102,13 @@ class KYCDocument(models.Model):
         ],
     )
 
+    class Meta:
+        constraints = [
+            # Mỗi loại tài liệu một bản / user (upload lại dùng update_or_create)
+            models.UniqueConstraint(
+                fields=["user", "doc_type"], name="kycdoc_user_doc_type_uniq"
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.username} - {self.doc_type}"
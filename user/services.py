@@ -0,0 +1,88 @@
+"""
+Services cho User app - Cache profile người dùng
+"""
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import UserProfile
+
+# Cache cục bộ (LocMem) không nhận lệnh xóa từ process khác nên chỉ giữ vài giây
+PROFILE_CACHE_TIMEOUT = 3600 if settings.CACHE_IS_SHARED else 5
+
+# Các cột profile cần cho trang đọc (dashboard, ví); cột khác được nạp khi truy cập.
+# Không cache balance: số dư luôn đọc trực tiếp từ DB qua get_balance()
+CACHED_PROFILE_FIELDS = ("id", "user_id", "kyc_status", "full_name")
+
+# Các cột form profile / KYC hiển thị và cập nhật
+PROFILE_FORM_FIELDS = (
+    "id",
+    "user_id",
+    "full_name",
+    "id_card_number",
+    "address",
+    "kyc_status",
+)
+KYC_FORM_FIELDS = PROFILE_FORM_FIELDS + (
+    "date_of_birth",
+    "gender",
+    "hometown",
+    "phone_number",
+    "occupation",
+    "company_name",
+    "monthly_income",
+    "kyc_note",
+    "ocr_match_score",
+)
+
+
+def _profile_cache_key(user_id):
+    return f"profile:{user_id}"
+
+
+def get_profile_only(user, fields):
+    """
+    Profile của user chỉ nạp các cột trong fields (bỏ qua ocr_data, ...).
+    Tạo profile nếu chưa có.
+    """
+    profile = UserProfile.objects.only(*fields).filter(user_id=user.pk).first()
+    if profile is None:
+        profile, _ = UserProfile.objects.get_or_create(user=user)
+    return profile
+
+
+def get_cached_profile(user):
+    """
+    Profile (chỉ gồm CACHED_PROFILE_FIELDS) của user, cache theo user_id.
+    Tạo profile nếu chưa có.
+    """
+    key = _profile_cache_key(user.pk)
+    profile = cache.get(key)
+    if profile is None:
+        profile = get_profile_only(user, CACHED_PROFILE_FIELDS)
+        cache.set(key, profile, PROFILE_CACHE_TIMEOUT)
+    return profile
+
+
+def get_balance(user):
+    """Số dư hiện tại của user (một truy vấn một cột, không qua cache)"""
+    balance = (
+        UserProfile.objects.filter(user_id=user.pk)
+        .values_list("balance", flat=True)
+        .first()
+    )
+    return balance if balance is not None else Decimal("0")
+
+
+def invalidate_cached_profile(*user_ids):
+    """
+    Xóa cache profile; gọi sau các cập nhật bằng queryset.update() (bỏ qua signal).
+    Xóa ngay và xóa lại sau khi transaction commit, để bản cache được tạo lại
+    từ dữ liệu cũ trong lúc transaction chưa commit không tồn tại tiếp.
+    """
+    keys = [_profile_cache_key(user_id) for user_id in user_ids]
+    cache.delete_many(keys)
+    transaction.on_commit(lambda: cache.delete_many(keys))
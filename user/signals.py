@@ -0,0 +1,28 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import KYCDocument, UserProfile
+from .services import invalidate_cached_profile
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def clear_profile_cache(sender, instance, **kwargs):
+    """Profile thay đổi thì bỏ bản cache"""
+    invalidate_cached_profile(instance.user_id)
+
+
+@receiver(pre_save, sender=KYCDocument)
+def delete_replaced_kyc_image(sender, instance, **kwargs):
+    """Upload lại tài liệu thì xóa file ảnh cũ khỏi storage sau khi commit"""
+    if not instance.pk:
+        return
+    old_name = (
+        KYCDocument.objects.filter(pk=instance.pk)
+        .values_list("image", flat=True)
+        .first()
+    )
+    if old_name and old_name != instance.image.name:
+        storage = instance.image.storage
+        transaction.on_commit(lambda: storage.delete(old_name))
@@ -0,0 +1,42 @@
+"""
+Tác vụ nền cho User app - OCR giấy tờ KYC
+"""
+
+from celery import shared_task
+
+
+@shared_task
+def run_kyc_ocr(doc_id):
+    """OCR tài liệu KYC bằng Vintern và lưu kết quả vào tài liệu / profile"""
+    from ai_agents.services.vintern_ocr import vintern_ocr
+    from .models import KYCDocument, UserProfile
+
+    doc = KYCDocument.objects.only("id", "user_id", "doc_type", "image").get(pk=doc_id)
+
+    try:
+        # Đọc ảnh một lần qua storage (không phụ thuộc image.path trên đĩa cục bộ)
+        with doc.image.open("rb") as image:
+            ocr_result = vintern_ocr.extract_from_bytes(image.read(), doc.doc_type)
+
+        if ocr_result.get("success"):
+            doc.ai_extracted_data = ocr_result.get("data", {})
+            doc.ocr_status = "SUCCESS"
+
+            # Lưu OCR data vào profile nếu là mặt trước
+            if doc.doc_type == "ID_CARD_FRONT":
+                UserProfile.objects.filter(user_id=doc.user_id).update(
+                    ocr_data=doc.ai_extracted_data
+                )
+        else:
+            doc.ocr_status = "FAILED"
+            doc.ai_extracted_data = {"error": ocr_result.get("error", "OCR failed")}
+
+    except Exception as e:
+        doc.ocr_status = "FAILED"
+        doc.ai_extracted_data = {"error": str(e)}
+
+    # Chỉ ghi hai cột kết quả, không nạp lại / lưu cả hàng
+    KYCDocument.objects.filter(pk=doc.pk).update(
+        ocr_status=doc.ocr_status, ai_extracted_data=doc.ai_extracted_data
+    )
+    return doc.ocr_status
@@ -12,8 +12,18 @@ urlpatterns = [
     path("profile/", views.profile_view, name="profile"),
     path("kyc/", views.kyc_view, name="kyc"),
     path("kyc/upload/", views.upload_kyc_document, name="kyc_upload"),
+    path(
+        "kyc/status/<int:doc_id>/",
+        views.kyc_document_status,
+        name="kyc_document_status",
+    ),
     path("kyc/submit/", views.submit_kyc, name="kyc_submit"),
     path("notifications/", views.notifications_view, name="notifications"),
+    path(
+        "notifications/read/",
+        views.mark_notifications_read,
+        name="mark_notifications_read",
+    ),
     path(
         "notifications/<int:notification_id>/read/",
         views.mark_notification_read,
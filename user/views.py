@@ -4,19 +4,62 @@ Views cho User app - Quản lý người dùng, KYC, Profile
 
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login, logout, authenticate
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib import messages
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F, Q
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.conf import settings
 
+from ai_agents.agents import borrower_profiler_agent
+from ai_agents.services.notifications import (
+    adjust_unread_count,
+    get_unread_count,
+    get_unread_notifications,
+    invalidate_unread_notifications,
+)
+from ai_agents.services.vintern_ocr import vintern_ocr
+
 from .models import UserProfile, KYCDocument
+from .services import (
+    KYC_FORM_FIELDS,
+    PROFILE_FORM_FIELDS,
+    get_balance,
+    get_cached_profile,
+    get_profile_only,
+    invalidate_cached_profile,
+)
+from .tasks import run_kyc_ocr
+
+
+# Số lần đăng nhập sai tối đa cho mỗi IP + username trong một cửa sổ cố định
+# LOGIN_FAILURE_WINDOW giây, tính từ lần sai đầu tiên (không trượt theo lần sai sau)
+LOGIN_MAX_FAILURES = 10
+LOGIN_FAILURE_WINDOW = 300
+
+
+NOTIFICATIONS_PAGE_SIZE = 50
+
+# Các cột submit_kyc ghi lại (không bao giờ gồm balance)
+KYC_RESULT_FIELDS = ("ocr_verified", "ocr_match_score", "ocr_data", "kyc_status")
+
+
+def _parse_amount(value, default=None):
+    """Chuỗi số tiền ("1,500,000") -> Decimal hữu hạn; không hợp lệ trả default"""
+    try:
+        amount = Decimal(str(value).replace(",", "").strip())
+    except (InvalidOperation, TypeError):
+        return default
+    return amount if amount.is_finite() else default
 
 
 def home_view(request):
@@ -36,19 +79,30 @@ def register_view(request):
             messages.error(request, "Mật khẩu không khớp!")
             return render(request, "user/register.html")
 
-        if User.objects.filter(username=username).exists():
-            messages.error(request, "Tên đăng nhập đã tồn tại!")
+        # Một truy vấn cho cả hai điều kiện trùng
+        conflict = (
+            User.objects.filter(Q(username=username) | Q(email=email))
+            .values_list("username", flat=True)
+            .first()
+        )
+        if conflict is not None:
+            if conflict == username:
+                messages.error(request, "Tên đăng nhập đã tồn tại!")
+            else:
+                messages.error(request, "Email đã được sử dụng!")
             return render(request, "user/register.html")
 
-        if User.objects.filter(email=email).exists():
-            messages.error(request, "Email đã được sử dụng!")
+        # Ràng buộc unique của username là chốt chặn thật khi đăng ký đồng thời
+        try:
+            with transaction.atomic():
+                user = User.objects.create_user(
+                    username=username, email=email, password=password
+                )
+                UserProfile.objects.create(user=user)
+        except IntegrityError:
+            messages.error(request, "Tên đăng nhập đã tồn tại!")
             return render(request, "user/register.html")
 
-        user = User.objects.create_user(
-            username=username, email=email, password=password
-        )
-        UserProfile.objects.create(user=user)
-
         login(request, user)
         messages.success(request, "Đăng ký thành công!")
         return redirect("user:dashboard")
@@ -62,12 +116,28 @@ def login_view(request):
         username = request.POST.get("username")
         password = request.POST.get("password")
 
+        # Chặn dò mật khẩu trước khi tốn CPU băm mật khẩu trong authenticate()
+        fail_key = f"login_fail:{request.META.get('REMOTE_ADDR')}:{username}"
+        if cache.get(fail_key, 0) >= LOGIN_MAX_FAILURES:
+            messages.error(
+                request, "Đăng nhập sai quá nhiều lần, vui lòng thử lại sau!"
+            )
+            return render(request, "user/login.html", status=429)
+
         user = authenticate(request, username=username, password=password)
         if user is not None:
+            cache.delete(fail_key)
             login(request, user)
             messages.success(request, f"Chào mừng {username}!")
             return redirect("user:dashboard")
         else:
+            # add() rồi incr() để tăng nguyên tử; key hết hạn / bị evict giữa hai
+            # lần gọi thì incr() báo ValueError, bắt đầu đếm lại từ 1
+            cache.add(fail_key, 0, LOGIN_FAILURE_WINDOW)
+            try:
+                cache.incr(fail_key)
+            except ValueError:
+                cache.set(fail_key, 1, LOGIN_FAILURE_WINDOW)
             messages.error(request, "Sai tên đăng nhập hoặc mật khẩu!")
 
     return render(request, "user/login.html")
@@ -84,23 +154,21 @@ def logout_view(request):
 @login_required
 def dashboard_view(request):
     """Trang chủ sau đăng nhập"""
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
-    notifications = request.user.notifications.filter(is_read=False)[:5]
+    profile = get_cached_profile(request.user)
+    notifications = get_unread_notifications(request.user.id)
+    unread_count = get_unread_count(request.user.id)
 
-    loan_requests = (
-        request.user.loan_requests.all()
-        if hasattr(request.user, "loan_requests")
-        else []
-    )
-    investments = (
-        request.user.investments.all() if hasattr(request.user, "investments") else []
-    )
+    # Cắt LIMIT 5 trong SQL, chỉ lấy các cột template hiển thị
+    loan_requests = request.user.loan_requests.only(
+        "id", "amount", "interest_rate", "duration_months", "status"
+    ).order_by("-created_at")[:5]
 
     context = {
         "profile": profile,
+        "balance": get_balance(request.user),
         "notifications": notifications,
-        "loan_requests": loan_requests[:5] if loan_requests else [],
-        "investments": investments[:5] if investments else [],
+        "unread_count": unread_count,
+        "loan_requests": loan_requests,
     }
     return render(request, "user/dashboard.html", context)
 
@@ -108,13 +176,13 @@ def dashboard_view(request):
 @login_required
 def profile_view(request):
     """Xem và cập nhật profile"""
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = get_profile_only(request.user, PROFILE_FORM_FIELDS)
 
     if request.method == "POST":
         profile.full_name = request.POST.get("full_name", "")
         profile.id_card_number = request.POST.get("id_card_number", "")
         profile.address = request.POST.get("address", "")
-        profile.save()
+        profile.save(update_fields=["full_name", "id_card_number", "address"])
         messages.success(request, "Cập nhật thông tin thành công!")
         return redirect("user:profile")
 
@@ -124,91 +192,86 @@ def profile_view(request):
 @login_required
 def kyc_view(request):
     """Trang xác thực KYC với form thông tin cá nhân chi tiết"""
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
-    kyc_docs = KYCDocument.objects.filter(user=request.user)
-
     if request.method == "POST":
         # Lưu thông tin cá nhân từ form
-        profile.full_name = request.POST.get("full_name", "")
-        profile.id_card_number = request.POST.get("id_card_number", "")
-        profile.date_of_birth = request.POST.get("date_of_birth") or None
-        profile.gender = request.POST.get("gender", "")
-        profile.hometown = request.POST.get("hometown", "")
-        profile.address = request.POST.get("address", "")
-        profile.phone_number = request.POST.get("phone_number", "")
-        profile.occupation = request.POST.get("occupation", "")
-        profile.company_name = request.POST.get("company_name", "")
-
-        monthly_income = request.POST.get("monthly_income", "0")
-        try:
-            profile.monthly_income = float(monthly_income.replace(",", ""))
-        except:
-            profile.monthly_income = 0
+        fields = {
+            "full_name": request.POST.get("full_name", ""),
+            "id_card_number": request.POST.get("id_card_number", ""),
+            "date_of_birth": request.POST.get("date_of_birth") or None,
+            "gender": request.POST.get("gender", ""),
+            "hometown": request.POST.get("hometown", ""),
+            "address": request.POST.get("address", ""),
+            "phone_number": request.POST.get("phone_number", ""),
+            "occupation": request.POST.get("occupation", ""),
+            "company_name": request.POST.get("company_name", ""),
+            "monthly_income": _parse_amount(
+                request.POST.get("monthly_income"), default=Decimal("0")
+            ),
+        }
 
-        profile.save()
+        # Một câu UPDATE chỉ gồm các cột của form, không nạp profile trước
+        if UserProfile.objects.filter(user_id=request.user.id).update(**fields):
+            invalidate_cached_profile(request.user.id)
+        else:
+            UserProfile.objects.create(user=request.user, **fields)
         messages.success(request, "Đã lưu thông tin cá nhân!")
         return redirect("user:kyc")
 
+    profile = get_profile_only(request.user, KYC_FORM_FIELDS)
+    kyc_docs = KYCDocument.objects.filter(user=request.user)
     return render(request, "user/kyc.html", {"profile": profile, "kyc_docs": kyc_docs})
 
 
 @login_required
 @require_http_methods(["POST"])
 def upload_kyc_document(request):
-    """Upload tài liệu KYC và OCR bằng Vintern"""
+    """Upload tài liệu KYC, OCR bằng Vintern chạy ở tác vụ nền"""
     doc_type = request.POST.get("doc_type")
     image = request.FILES.get("image")
 
     if not image:
         return JsonResponse({"success": False, "error": "Chưa chọn file!"})
 
-    # Xóa tài liệu cũ nếu có
-    KYCDocument.objects.filter(user=request.user, doc_type=doc_type).delete()
-    doc = KYCDocument.objects.create(user=request.user, doc_type=doc_type, image=image)
-    doc.ocr_status = "PROCESSING"
-    doc.save()
-
-    # OCR bằng Vintern
-    try:
-        from ai_agents.services.vintern_ocr import vintern_ocr
-
-        image_path = doc.image.path
-
-        if doc_type == "ID_CARD_FRONT":
-            ocr_result = vintern_ocr.extract_id_card_front(image_path)
-        elif doc_type == "ID_CARD_BACK":
-            ocr_result = vintern_ocr.extract_id_card_back(image_path)
-        else:
-            ocr_result = {"success": False, "error": "Loại tài liệu không hỗ trợ"}
-
-        if ocr_result.get("success"):
-            doc.ai_extracted_data = ocr_result.get("data", {})
-            doc.ocr_status = "SUCCESS"
+    # Ghi đè tài liệu cũ cùng loại (ảnh cũ được xóa trong signal pre_save)
+    doc, _ = KYCDocument.objects.update_or_create(
+        user=request.user,
+        doc_type=doc_type,
+        defaults={
+            "image": image,
+            "ocr_status": "PROCESSING",
+            "ai_extracted_data": None,
+        },
+    )
 
-            # Lưu OCR data vào profile nếu là mặt trước
-            if doc_type == "ID_CARD_FRONT":
-                profile = request.user.profile
-                profile.ocr_data = ocr_result.get("data", {})
-                profile.save()
-        else:
-            doc.ocr_status = "FAILED"
-            doc.ai_extracted_data = {"error": ocr_result.get("error", "OCR failed")}
+    UserProfile.objects.filter(user_id=request.user.id).update(kyc_status="PENDING")
+    invalidate_cached_profile(request.user.id)
 
-        doc.save()
+    # OCR bằng Vintern ở tác vụ nền (queue GPU); client polling kyc_document_status
+    run_kyc_ocr.delay(doc.id)
+    doc.refresh_from_db(fields=["ocr_status", "ai_extracted_data"])
 
-    except Exception as e:
-        doc.ocr_status = "FAILED"
-        doc.ai_extracted_data = {"error": str(e)}
-        doc.save()
+    return JsonResponse(
+        {
+            "success": True,
+            "message": "Upload thành công!",
+            "doc_id": doc.id,
+            "ocr_status": doc.ocr_status,
+            "ocr_data": doc.ai_extracted_data,
+        }
+    )
 
-    profile = request.user.profile
-    profile.kyc_status = "PENDING"
-    profile.save()
 
+@login_required
+def kyc_document_status(request, doc_id):
+    """Trạng thái OCR của tài liệu KYC (client polling sau khi upload)"""
+    doc = get_object_or_404(
+        KYCDocument.objects.only("id", "user_id", "ocr_status", "ai_extracted_data"),
+        id=doc_id,
+        user=request.user,
+    )
     return JsonResponse(
         {
             "success": True,
-            "message": "Upload thành công!",
             "doc_id": doc.id,
             "ocr_status": doc.ocr_status,
             "ocr_data": doc.ai_extracted_data,
@@ -219,22 +282,21 @@ def upload_kyc_document(request):
 @login_required
 def submit_kyc(request):
     """Submit KYC để AI đánh giá và xác minh thông tin"""
-    from ai_agents.agents import BorrowerProfilerAgent
-    from ai_agents.services.vintern_ocr import vintern_ocr
-
-    docs = KYCDocument.objects.filter(user=request.user)
-    doc_types = [d.doc_type for d in docs]
+    # Một truy vấn cho cả hai mặt CCCD
+    docs_by_type = {
+        doc.doc_type: doc
+        for doc in KYCDocument.objects.filter(
+            user=request.user, doc_type__in=["ID_CARD_FRONT", "ID_CARD_BACK"]
+        ).only("id", "doc_type", "ai_extracted_data")
+    }
 
-    if "ID_CARD_FRONT" not in doc_types or "ID_CARD_BACK" not in doc_types:
+    if len(docs_by_type) < 2:
         return JsonResponse({"success": False, "error": "Vui lòng upload đầy đủ CCCD!"})
 
     profile = request.user.profile
 
     # Lấy OCR data từ CCCD mặt trước
-    id_front = docs.filter(doc_type="ID_CARD_FRONT").first()
-    ocr_data = (
-        id_front.ai_extracted_data if id_front and id_front.ai_extracted_data else {}
-    )
+    ocr_data = docs_by_type["ID_CARD_FRONT"].ai_extracted_data or {}
 
     # So sánh thông tin người dùng nhập với OCR data
     user_data = {
@@ -246,8 +308,14 @@ def submit_kyc(request):
         "address": profile.address,
     }
 
-    # Verify bằng LLM
-    verify_result = vintern_ocr.verify_user_info(user_data, ocr_data)
+    # Verify bằng LLM ở luồng phụ, song song với AI Agent đánh giá tổng thể.
+    # verify_user_info không truy cập DB nên không cần kết nối riêng cho luồng phụ
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        verify_future = executor.submit(
+            vintern_ocr.verify_user_info, user_data, ocr_data
+        )
+        result = borrower_profiler_agent.process(request.user)
+        verify_result = verify_future.result()
 
     profile.ocr_verified = verify_result.get("is_verified", False)
     profile.ocr_match_score = verify_result.get("match_score", 0)
@@ -257,13 +325,11 @@ def submit_kyc(request):
         "verification": verify_result,
     }
 
-    # Gọi AI Agent để đánh giá tổng thể
-    agent = BorrowerProfilerAgent()
-    result = agent.process(request.user)
-
     if result["success"] and profile.ocr_match_score >= 70:
         profile.kyc_status = "VERIFIED"
-        profile.save()
+        # Chỉ ghi các cột KYC: profile được nạp trước các lệnh gọi LLM chậm, ghi cả
+        # hàng sẽ đè balance cũ lên thay đổi ví xảy ra trong lúc chờ
+        profile.save(update_fields=[*KYC_RESULT_FIELDS])
         return JsonResponse(
             {
                 "success": True,
@@ -291,7 +357,7 @@ def submit_kyc(request):
             rejection_reason.append(result.get("error", "Lỗi AI đánh giá"))
 
         profile.kyc_note = "; ".join(rejection_reason)
-        profile.save()
+        profile.save(update_fields=[*KYC_RESULT_FIELDS, "kyc_note"])
 
         return JsonResponse(
             {
@@ -309,27 +375,66 @@ def submit_kyc(request):
 
 @login_required
 def notifications_view(request):
-    """Xem tất cả thông báo"""
-    notifications = request.user.notifications.all().order_by("-created_at")
-    return render(request, "user/notifications.html", {"notifications": notifications})
+    """Xem thông báo, phân trang theo keyset (?before=<id>), không dùng OFFSET"""
+    notifications = request.user.notifications.order_by("-id")
+    before = request.GET.get("before", "")
+    if before.isdigit():
+        notifications = notifications.filter(id__lt=int(before))
+
+    # Lấy dư một bản ghi để biết còn trang sau hay không
+    notifications = list(notifications[: NOTIFICATIONS_PAGE_SIZE + 1])
+    has_more = len(notifications) > NOTIFICATIONS_PAGE_SIZE
+    notifications = notifications[:NOTIFICATIONS_PAGE_SIZE]
+
+    context = {
+        "notifications": notifications,
+        "next_before": notifications[-1].id if has_more else None,
+    }
+    return render(request, "user/notifications.html", context)
 
 
 @login_required
 @require_http_methods(["POST"])
 def mark_notification_read(request, notification_id):
     """Đánh dấu thông báo đã đọc"""
-    notification = get_object_or_404(request.user.notifications, id=notification_id)
-    notification.is_read = True
-    notification.save()
+    # Một câu UPDATE, không SELECT + save() cả hàng
+    updated = request.user.notifications.filter(
+        id=notification_id, is_read=False
+    ).update(is_read=True)
+    if updated:
+        invalidate_unread_notifications(request.user.id)
+        adjust_unread_count(request.user.id, -updated)
+    elif not request.user.notifications.filter(id=notification_id).exists():
+        return JsonResponse({"success": False, "error": "Không tìm thấy thông báo!"})
     return JsonResponse({"success": True})
 
 
+@login_required
+@require_http_methods(["POST"])
+def mark_notifications_read(request):
+    """Đánh dấu nhiều thông báo đã đọc (body JSON: {"ids": [...]})"""
+    try:
+        ids = [int(i) for i in json.loads(request.body).get("ids", [])]
+    except (ValueError, TypeError, AttributeError):
+        return JsonResponse({"success": False, "error": "Dữ liệu không hợp lệ!"})
+
+    updated = request.user.notifications.filter(id__in=ids, is_read=False).update(
+        is_read=True
+    )
+    if updated:
+        invalidate_unread_notifications(request.user.id)
+        adjust_unread_count(request.user.id, -updated)
+    return JsonResponse({"success": True, "updated": updated})
+
+
 @login_required
 def wallet_view(request):
     """Xem ví tiền"""
-    profile, _ = UserProfile.objects.get_or_create(user=request.user)
+    profile = get_cached_profile(request.user)
     return render(
-        request, "user/wallet.html", {"profile": profile, "balance": profile.balance}
+        request,
+        "user/wallet.html",
+        {"profile": profile, "balance": get_balance(request.user)},
     )
 
 
@@ -338,18 +443,21 @@ def wallet_view(request):
 def deposit(request):
     """Nạp tiền vào ví"""
     try:
-        amount = Decimal(str(request.POST.get("amount", 0)))
-        if amount <= 0:
+        amount = _parse_amount(request.POST.get("amount"))
+        if amount is None or amount <= 0:
             return JsonResponse({"success": False, "error": "Số tiền không hợp lệ!"})
 
-        profile = request.user.profile
-        profile.balance += amount
-        profile.save()
+        # Cộng trong SQL, không đọc-sửa-ghi để hai lần nạp đồng thời không mất
+        profiles = UserProfile.objects.filter(user_id=request.user.id)
+        with transaction.atomic():
+            profiles.update(balance=F("balance") + amount)
+            new_balance = profiles.values_list("balance", flat=True).get()
+        invalidate_cached_profile(request.user.id)
         return JsonResponse(
             {
                 "success": True,
                 "message": f"Nạp {amount:,.0f} VNĐ thành công!",
-                "new_balance": float(profile.balance),
+                "new_balance": float(new_balance),
             }
         )
     except Exception as e:
@@ -361,21 +469,25 @@ def deposit(request):
 def withdraw(request):
     """Rút tiền từ ví"""
     try:
-        amount = Decimal(str(request.POST.get("amount", 0)))
-        profile = request.user.profile
-
-        if amount <= 0:
+        amount = _parse_amount(request.POST.get("amount"))
+        if amount is None or amount <= 0:
             return JsonResponse({"success": False, "error": "Số tiền không hợp lệ!"})
-        if amount > profile.balance:
-            return JsonResponse({"success": False, "error": "Số dư không đủ!"})
 
-        profile.balance -= amount
-        profile.save()
+        # Chỉ trừ khi đủ số dư, kiểm tra và trừ trong cùng một câu UPDATE
+        profiles = UserProfile.objects.filter(user_id=request.user.id)
+        with transaction.atomic():
+            debited = profiles.filter(balance__gte=amount).update(
+                balance=F("balance") - amount
+            )
+            if not debited:
+                return JsonResponse({"success": False, "error": "Số dư không đủ!"})
+            new_balance = profiles.values_list("balance", flat=True).get()
+        invalidate_cached_profile(request.user.id)
         return JsonResponse(
             {
                 "success": True,
                 "message": f"Rút {amount:,.0f} VNĐ thành công!",
-                "new_balance": float(profile.balance),
+                "new_balance": float(new_balance),
             }
         )
     except Exception as e: